@@ -9,19 +9,41 @@ import sqlite3
 from contextlib import closing
 import pathlib
 import json
+import re
 import sys
 import subprocess
+import shutil
 import hashlib
 import functools
+import heapq
 import csv
 from datetime import datetime, date, timedelta
+from dateutil import parser as dtparser
 from typing import List, Dict, Optional
 import signal
 
-from flask import Flask, render_template, request, redirect, url_for, send_file, jsonify, session, Response
+from flask import Flask, render_template, request, redirect, url_for, send_file, send_from_directory, jsonify, session, Response
+from werkzeug.exceptions import NotFound
 import hmac
 import secrets
+import uuid
 from collections import deque
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import orjson  # optional: much faster JSON parsing for large schedule files
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: streaming JSON, used to count events without building them
+    # the pure-Python backend is slower than a full json.load; only use C ones
+    if ijson.backend not in ('yajl2_c', 'yajl2_cffi'):
+        ijson = None
+except ImportError:
+    ijson = None
 
 from timetable import (
     Event,
@@ -31,6 +53,39 @@ from timetable import (
     parse_microformat_vevents,
 )
 
+# Title/location parsing for the departures board and events page (optional:
+# both fall back to the stored fields when tools/ is unavailable).
+try:
+    from tools.event_parser import parse_event, parse_group_cached, parse_title_cached
+except Exception:
+    parse_event = None
+    parse_group_cached = None
+    parse_title_cached = None
+
+# Project paths (constant for the process lifetime)
+BASE_DIR = pathlib.Path(__file__).parent
+PC_DIR = BASE_DIR / 'playwright_captures'
+STDOUT_PATH = PC_DIR / 'extract_stdout.txt'
+STDERR_PATH = PC_DIR / 'extract_stderr.txt'
+PIDFILE = PC_DIR / 'extract_detached.pid'
+PROG_PATH = PC_DIR / 'import_progress.json'
+FRONTEND_DIST = BASE_DIR / 'frontend' / 'dist'
+FRONTEND_INDEX = FRONTEND_DIST / 'index.html'
+
+
+def _resolve_venv_python(base: pathlib.Path) -> Optional[str]:
+    """Return the first executable interpreter in common project venv locations."""
+    for c in (base / '.venv' / 'bin' / 'python3', base / '.venv' / 'bin' / 'python',
+              base / 'env' / 'bin' / 'python3', base / 'env' / 'bin' / 'python'):
+        if os.access(c, os.X_OK):
+            return str(c)
+    return None
+
+
+# Interpreter for detached extractor runs: explicit APP_PYTHON, else the
+# project venv, else our own. Resolved once per process.
+_APP_PYTHON = os.environ.get('APP_PYTHON') or _resolve_venv_python(BASE_DIR) or sys.executable
+
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.environ.get("FLASK_SECRET", "dev-secret")
 
@@ -40,41 +95,180 @@ app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
 app.json.compact = True
 
 # ── Performance: In-memory schedule cache ──
-# Avoid re-reading schedule_by_room.json from disk on every /events.json request.
-# Cache is invalidated when the file's mtime changes.
+# Avoid re-walking schedule_by_room.json on every /departures.json request.
+# The per-day index is rebuilt whenever _read_json_cached hands back a
+# different parsed object (i.e. the file changed).
 _schedule_cache_lock = threading.Lock()
 _schedule_cache = {
-    'data': None,      # parsed JSON dict
-    'mtime': 0,        # last known mtime of the file
+    'data': None,      # parsed JSON dict the index was built from
+    'by_day': {},      # day -> [(seq, event with room/_origin set), ...]
     'path': None,      # path that was cached
 }
 
 # TTL-based JSON file cache for any frequently-read file
 _file_cache_lock = threading.Lock()
-_file_cache = {}  # path -> {'data': ..., 'mtime': ..., 'ts': ...}
+_file_cache = {}  # path -> {'data': ..., 'mtime': (mtime_ns, size), 'ts': monotonic}
 _FILE_CACHE_TTL = 10  # seconds - re-stat the file at most every 10s
+_JSON_READ_BUFSIZE = 64 * 1024  # read large JSON files in 64 KiB chunks
+
+
+def _load_json_file(file_path) -> object:
+    """Parse a JSON file, using orjson on the raw bytes when available."""
+    p = pathlib.Path(file_path)
+    if orjson is not None:
+        return orjson.loads(p.read_bytes())
+    # json.loads accepts UTF-8 bytes directly, skipping the text-layer decode
+    with open(p, 'rb', buffering=_JSON_READ_BUFSIZE) as f:
+        return json.loads(f.read())
+
+
+def _sibling_tempfile(p: pathlib.Path):
+    """Create a uniquely named temp file next to `p`; returns (fd, path).
+
+    mkstemp creates it 0600, so it gets the target's current mode (0644 for a new
+    file) to keep the replaced file readable as before.
+    """
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=p.name + '.')
+    try:
+        mode = os.stat(p).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    try:
+        os.fchmod(fd, mode)
+    except OSError:
+        pass
+    return fd, tmp
+
+
+def _atomic_write_bytes(file_path, data: bytes) -> None:
+    """Write `data` to a sibling temp file and os.replace() it into place.
+
+    Readers see either the old or the new file, never a truncated one.
+    """
+    p = pathlib.Path(file_path)
+    fd, tmp = _sibling_tempfile(p)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _dump_json_file(file_path, obj) -> None:
+    """Atomically write `obj` as 2-space indented JSON (orjson when available)."""
+    if orjson is not None:
+        data = orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    _atomic_write_bytes(file_path, data)
+
+
+def _append_json_array_file(file_path, items: list) -> bool:
+    """Append `items` to the indented JSON array in `file_path` without parsing it.
+
+    The file is copied into a unique sibling temp file, the copy's closing
+    bracket is overwritten with the new items and the copy is
+    renamed into place, so readers still never see a partial file. Returns
+    False when the file does not end like a non-empty array; callers then
+    fall back to a full rewrite.
+    """
+    p = pathlib.Path(file_path)
+    with open(p, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+    body = tail.rstrip()
+    if not body.endswith(b']'):
+        return False
+    head = body[:-1].rstrip()
+    if not head or head.endswith((b'[', b',')):
+        return False
+    if orjson is not None:
+        data = orjson.dumps(items, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(items, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    fd, tmp = _sibling_tempfile(p)
+    try:
+        with os.fdopen(fd, 'r+b') as f:
+            with open(p, 'rb') as src:
+                shutil.copyfileobj(src, f)
+            f.seek(size - len(tail) + len(head))
+            f.write(b',' + data[1:])  # '[\n  {...}\n]' -> ',\n  {...}\n]'
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse a timestamp: C-level fromisoformat for ISO input, dateutil otherwise."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return dtparser.parse(value)
+
+
+def _json_response(payload, status: int = 200, sort_keys: bool = True) -> Response:
+    """jsonify() replacement that serializes with orjson when available.
+
+    Keys are sorted like Flask's default provider unless sort_keys=False,
+    which fixed-shape payloads (built in a deterministic order, so ETags stay
+    stable anyway) can use to skip the sort. Anything orjson rejects goes
+    through jsonify.
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            body = orjson.dumps(payload, option=option)
+            return app.response_class(body, status=status, mimetype='application/json')
+        except TypeError:
+            pass
+    resp = jsonify(payload)
+    resp.status_code = status
+    return resp
 
 
 def _read_json_cached(file_path: str, ttl: int = _FILE_CACHE_TTL):
-    """Read and cache a JSON file, re-reading only when mtime changes."""
-    now = time.time()
+    """Read and cache a JSON file, re-reading only when it changes.
+
+    Within `ttl` seconds of the last check the cached value is returned
+    without touching the filesystem; after that a single stat decides
+    whether the file must be re-parsed.
+    """
+    now = time.monotonic()
     with _file_cache_lock:
         entry = _file_cache.get(file_path)
         if entry and (now - entry['ts']) < ttl:
             return entry['data']
 
     try:
-        p = pathlib.Path(file_path)
-        if not p.exists():
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             return None
-        mtime = p.stat().st_mtime
+        mtime = (st.st_mtime_ns, st.st_size)
         with _file_cache_lock:
             entry = _file_cache.get(file_path)
             if entry and entry['mtime'] == mtime:
                 entry['ts'] = now
                 return entry['data']
-        with open(p, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json_file(file_path)
         with _file_cache_lock:
             _file_cache[file_path] = {'data': data, 'mtime': mtime, 'ts': now}
         return data
@@ -82,6 +276,60 @@ def _read_json_cached(file_path: str, ttl: int = _FILE_CACHE_TTL):
         return None
 
 
+def _read_schedule_by_day_cached(file_path: str) -> dict:
+    """Return schedule_by_room.json flattened into per-day event lists.
+
+    Each entry is `(seq, event)` where `seq` is the event's position in the
+    room -> day -> events walk, so merging several days by `seq` keeps the
+    file's order. Events already carry `room` and `_origin`; callers must
+    copy them before mutating.
+    """
+    schedule = _read_json_cached(file_path)
+    if not schedule or not isinstance(schedule, dict):
+        return {}
+    with _schedule_cache_lock:
+        if _schedule_cache['data'] is schedule and _schedule_cache['path'] == file_path:
+            return _schedule_cache['by_day']
+    by_day = {}
+    seq = 0
+    for room, days in schedule.items():
+        for day, evs in days.items():
+            bucket = by_day.setdefault(day, [])
+            for e in evs:
+                ec = {**e, 'room': room}
+                ec.setdefault('_origin', 'schedule_by_room')
+                bucket.append((seq, ec))
+                seq += 1
+    with _schedule_cache_lock:
+        _schedule_cache.update(data=schedule, by_day=by_day, path=file_path)
+    return by_day
+
+
+_events_json_cache = {'data': None, 'events': [], 'path': None}
+
+
+def _read_events_json_cached(file_path: str) -> list:
+    """Return the event dicts of events.json, tagged with `_origin`.
+
+    Validation and tagging run once per parsed file (whenever
+    _read_json_cached returns a new object); entries that are not dicts
+    are dropped. Callers must copy the list before extending it.
+    """
+    loaded = _read_json_cached(file_path)
+    if not loaded or not isinstance(loaded, list):
+        return []
+    with _schedule_cache_lock:
+        if _events_json_cache['data'] is loaded and _events_json_cache['path'] == file_path:
+            return _events_json_cache['events']
+    events = [it for it in loaded if isinstance(it, dict)]
+    for it in events:
+        # mark origin for debugging
+        it.setdefault('_origin', 'events_json')
+    with _schedule_cache_lock:
+        _events_json_cache.update(data=loaded, events=events, path=file_path)
+    return events
+
+
 # Admin authentication
 # Defaults kept to preserve existing tests; change via env in production
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
@@ -333,9 +581,8 @@ def admin_index():
         events_file = out_dir / 'events.json'
         if events_file.exists() and not event_files:
             try:
-                with open(events_file, 'r', encoding='utf-8') as f:
-                    events = json.load(f)
-                    events_count = len(events)
+                events = _load_events_with_log(events_file)
+                events_count = len(events)
                 last_import = events_file.stat().st_mtime
             except Exception:
                 pass
@@ -446,8 +693,7 @@ def debug_pipeline():
     try:
         merged = out_dir / 'events.json'
         if merged.exists():
-            with open(merged, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_events_with_log(merged)
             diag['events_json_count'] = len(data) if isinstance(data, list) else 'not-a-list'
         else:
             diag['events_json_count'] = 'MISSING'
@@ -534,7 +780,7 @@ def log_js_error():
 @app.route("/", methods=["GET"])
 def index():
     """Serve the React SPA frontend directly on root."""
-    frontend_dist = pathlib.Path(__file__).parent / 'frontend' / 'dist' / 'index.html'
+    frontend_dist = FRONTEND_INDEX
     if frontend_dist.exists():
                 # Read the built index.html and inject a small resilient fallback UI
                 # that links to the server-rendered Live board when the SPA bundle
@@ -594,7 +840,6 @@ def parse_ics_direct(text: str) -> List[Event]:
 
     cal = Calendar(text)
     evs: List[Event] = []
-    from dateutil import parser as dtparser
 
     for e in cal.events:
         try:
@@ -740,7 +985,8 @@ def _events_files_fingerprint() -> tuple:
     Also incorporates the import_complete.txt mtime so that when the detached
     extractor finishes (and writes that marker), we detect the change even
     though all individual events_*.json files may already exist from an earlier
-    pass.
+    pass.  calendar_map.json is included too, since the schedule build takes
+    each calendar's color from it.
     """
     out_dir = pathlib.Path('playwright_captures')
     max_mt = 0.0
@@ -757,14 +1003,15 @@ def _events_files_fingerprint() -> tuple:
     except Exception:
         pass
     # Include import_complete.txt mtime so a finished extraction forces rebuild
-    try:
-        ic = out_dir / 'import_complete.txt'
-        if ic.exists():
-            ic_mt = ic.stat().st_mtime
-            if ic_mt > max_mt:
-                max_mt = ic_mt
-    except Exception:
-        pass
+    for marker in ('import_complete.txt', 'calendar_map.json'):
+        try:
+            ic = out_dir / marker
+            if ic.exists():
+                ic_mt = ic.stat().st_mtime
+                if ic_mt > max_mt:
+                    max_mt = ic_mt
+        except Exception:
+            pass
     return (max_mt, count)
 
 
@@ -855,6 +1102,9 @@ def ensure_schedule(from_date: date, to_date: date):
         script = pathlib.Path('tools') / 'build_schedule_by_room.py'
         if not script.exists():
             raise FileNotFoundError(script)
+        # The builder falls back to events.json; fold the manual-event log
+        # in first (normally a no-op, the appender already folded it)
+        _materialize_events_json(out_dir / 'events.json')
         cmd = [sys.executable, str(script),
                '--from', build_from.isoformat(),
                '--to', build_to.isoformat()]
@@ -921,9 +1171,47 @@ def ensure_schedule(from_date: date, to_date: date):
         except Exception:
             pass
 
+    # Refresh the materialized view now so the next /events.json does not pay for it
+    try:
+        init_db()
+        _materialize_schedule_events(jpath)
+    except Exception as e:
+        app.logger.warning('ensure_schedule: failed to materialize schedule_events: %s', e)
+
     return jpath, cpath
 
 
+# ── Debounced background schedule regeneration ──
+# Admin edits call _request_schedule_regen() instead of running
+# ensure_schedule() inline; a burst of edits collapses into one rebuild.
+_SCHEDULE_REGEN_DEBOUNCE = 0.2
+_schedule_regen_pending = threading.Event()
+_schedule_regen_lock = threading.Lock()
+_schedule_regen_started = False
+
+
+def _schedule_regen_loop():
+    while True:
+        _schedule_regen_pending.wait()
+        time.sleep(_SCHEDULE_REGEN_DEBOUNCE)
+        _schedule_regen_pending.clear()
+        try:
+            today = date.today()
+            ensure_schedule(today, today + timedelta(days=7))
+        except Exception as e:
+            app.logger.warning('background schedule regeneration failed: %s', e)
+
+
+def _request_schedule_regen():
+    """Schedule an asynchronous ensure_schedule() (starts the worker once)."""
+    global _schedule_regen_started
+    with _schedule_regen_lock:
+        if not _schedule_regen_started:
+            threading.Thread(target=_schedule_regen_loop, daemon=True).start()
+            _schedule_regen_started = True
+    _schedule_regen_pending.set()
+
+
 # Background extractor state
 extractor_state = {
     'running': False,
@@ -960,7 +1248,7 @@ def _display_name_for(url: str, calendar_name: str | None = None) -> str:
         if map_path.exists():
             with open(map_path, 'r', encoding='utf-8') as f:
                 cmap = json.load(f)
-            h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+            h = _url_hash(url)
             meta = cmap.get(h) or {}
             if meta.get('name'):
                 return meta.get('name')
@@ -996,16 +1284,25 @@ DB_PATH.parent.mkdir(exist_ok=True)
 
 # Track sqlite3 connections created during runtime so we can close any that
 # accidentally remain open (helps silence ResourceWarning during tests and
-# ensures cleaner shutdown). We still prefer callers to use `with
-# get_db_connection() as conn:` so connections are closed promptly.
+# ensures cleaner shutdown). App code goes through get_db_connection(),
+# which reuses one connection per thread. Only weak references are kept, so
+# tracking never keeps a dropped connection (and its fd) alive.
 import atexit
-_OPEN_SQLITE_CONNS = []
+import weakref
+
+
+class _TrackedConnection(sqlite3.Connection):
+    """sqlite3.Connection that supports weak references (the base type doesn't)."""
+
+
+_OPEN_SQLITE_CONNS = weakref.WeakSet()
 _ORIG_SQLITE_CONNECT = sqlite3.connect
 
 def _tracking_sqlite_connect(*args, **kwargs):
+    kwargs.setdefault('factory', _TrackedConnection)
     conn = _ORIG_SQLITE_CONNECT(*args, **kwargs)
     try:
-        _OPEN_SQLITE_CONNS.append(conn)
+        _OPEN_SQLITE_CONNS.add(conn)
     except Exception:
         pass
     return conn
@@ -1023,8 +1320,37 @@ def _close_tracked_connections():
 
 atexit.register(_close_tracked_connections)
 
+# One connection per thread, reused across requests. The sqlite3 context
+# manager (`with get_db_connection() as conn:`) only commits/rolls back, it
+# does not close, so callers are unaffected. The connection hangs off a
+# holder in the thread-local; when the thread exits (prefetch pool workers,
+# extractor threads, recycled gthread workers) the holder is dropped and its
+# finalizer closes the connection.
+_db_local = threading.local()
+
+
+class _DbConnHolder:
+    __slots__ = ('conn', 'key', 'close', '__weakref__')
+
+    def __init__(self, conn, key):
+        self.conn = conn
+        self.key = key
+        self.close = weakref.finalize(self, conn.close)
+
+
 def get_db_connection():
-    conn = sqlite3.connect(str(DB_PATH), timeout=30)
+    db_key = str(DB_PATH)
+    holder = getattr(_db_local, 'holder', None)
+    if holder is not None:
+        if holder.key == db_key:
+            return holder.conn
+        try:
+            holder.close()
+        except Exception:
+            pass
+    # check_same_thread=False only so the finalizer may close it from
+    # whichever thread drops the holder; it is never shared otherwise
+    conn = sqlite3.connect(db_key, timeout=30, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     # ── Performance: WAL mode + tuning for concurrent reads ──
     if os.environ.get('SQLITE_WAL_MODE', ''):
@@ -1034,10 +1360,20 @@ def get_db_connection():
         conn.execute('PRAGMA mmap_size=268435456')  # 256 MB memory-mapped I/O
         conn.execute('PRAGMA temp_store=MEMORY')
         conn.execute('PRAGMA busy_timeout=10000')   # 10s busy timeout
+    _db_local.holder = _DbConnHolder(conn, db_key)
     return conn
 
+# DB_PATH for which the schema has already been created/migrated in this
+# process; init_db() is a no-op until DB_PATH changes (tests swap it).
+_db_initialized_for = None
+
+
 def init_db():
     """Create tables if they do not exist."""
+    global _db_initialized_for
+    db_key = str(DB_PATH)
+    if _db_initialized_for == db_key:
+        return
     with get_db_connection() as conn:
         cur = conn.cursor()
         cur.execute('''
@@ -1075,6 +1411,41 @@ def init_db():
                 created_at TEXT
             )
         ''')
+        # Flattened copy of schedule_by_room.json served by /events.json
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS schedule_events (
+                id INTEGER PRIMARY KEY,
+                title TEXT,
+                display_title TEXT,
+                start TEXT,
+                end TEXT,
+                room TEXT,
+                building TEXT,
+                subject TEXT,
+                professor TEXT,
+                location TEXT,
+                color TEXT,
+                source TEXT,
+                calendar_name TEXT,
+                year TEXT,
+                group_name TEXT,
+                group_display TEXT,
+                day TEXT,
+                schedule_room TEXT,
+                search_lc TEXT,
+                professor_lc TEXT,
+                room_lc TEXT,
+                schedule_room_lc TEXT
+            )
+        ''')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_schedule_events_day ON schedule_events (day)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_schedule_events_start ON schedule_events (start)')
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS schedule_events_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
         conn.commit()
     # ensure older DBs have the color column
     try:
@@ -1161,6 +1532,7 @@ def init_db():
                 conn.commit()
         except Exception:
             pass
+    _db_initialized_for = db_key
 
 def migrate_from_files():
     """Migrate existing JSON configs into the DB if present."""
@@ -1349,8 +1721,8 @@ def _run_extractor_background():
     def _read_rooms_publisher():
         # Try several likely locations for the publisher CSV (config/, project root)
         csv_filename = 'Rooms_PUBLISHER_HTML-ICS(in).csv'
-        candidates = [pathlib.Path(__file__).parent / 'config' / csv_filename,
-                      pathlib.Path(__file__).parent / csv_filename,
+        candidates = [BASE_DIR / 'config' / csv_filename,
+                      BASE_DIR / csv_filename,
                       pathlib.Path(csv_filename)]
         for p in candidates:
             try:
@@ -1393,7 +1765,7 @@ def _run_extractor_background():
             wanted_hashes = set()
             for u, _n, *_rest in combined:
                 try:
-                    h = hashlib.sha1(u.encode('utf-8')).hexdigest()[:8]
+                    h = _url_hash(u)
                     wanted_hashes.add(h)
                 except Exception:
                     continue
@@ -1409,7 +1781,7 @@ def _run_extractor_background():
                         h = None
                     if h and h not in wanted_hashes:
                         try:
-                            p.unlink()
+                            _remove_events_file(p)
                         except Exception:
                             pass
                 # remove extractor per-url stdout/stderr pairs for removed hashes
@@ -1436,19 +1808,14 @@ def _run_extractor_background():
                         except Exception:
                             pass
                 # prune calendar_map.json keys not in wanted_hashes
+                def _prune(cmap: dict) -> bool:
+                    stale = [key for key in cmap if key not in wanted_hashes]
+                    for key in stale:
+                        del cmap[key]
+                    return bool(stale)
+
                 try:
-                    map_path = cap_dir / 'calendar_map.json'
-                    if map_path.exists():
-                        with open(map_path, 'r', encoding='utf-8') as mf:
-                            cmap = json.load(mf)
-                        changed = False
-                        for key in list(cmap.keys()):
-                            if key not in wanted_hashes:
-                                cmap.pop(key, None)
-                                changed = True
-                        if changed:
-                            with open(map_path, 'w', encoding='utf-8') as mf:
-                                json.dump(cmap, mf, indent=2, ensure_ascii=False)
+                    _mutate_calendar_map(_prune, map_path=cap_dir / 'calendar_map.json')
                 except Exception:
                     pass
 
@@ -1494,7 +1861,7 @@ def _run_extractor_background():
                 f.write(datetime.utcnow().isoformat() + '\n')
             # import_progress.json with final totals
             total = len(combined)
-            succeeded = sum(1 for u, n in combined if (pathlib.Path('playwright_captures') / f'events_{hashlib.sha1(u.encode("utf-8")).hexdigest()[:8]}.json').exists())
+            succeeded = sum(1 for u, n in combined if (pathlib.Path('playwright_captures') / f'events_{_url_hash(u)}.json').exists())
             import json as _json
             with open(cap_dir / 'import_progress.json', 'w', encoding='utf-8') as f:
                 _json.dump({
@@ -1517,9 +1884,7 @@ def _run_extractor_background():
     cmd = [sys.executable, str(script)]
     try:
         # ensure child python runs use UTF-8 on Windows (avoid cp1252 issues)
-        env = os.environ.copy()
-        env.setdefault('PYTHONUTF8', '1')
-        env.setdefault('PYTHONIOENCODING', 'utf-8')
+        env = _child_env()
         with open(stdout_path, 'w', encoding='utf-8') as out_f, open(stderr_path, 'w', encoding='utf-8') as err_f:
             proc = subprocess.run(cmd, stdout=out_f, stderr=err_f, text=True, env=env)
             extractor_state['last_rc'] = proc.returncode
@@ -1535,6 +1900,360 @@ def _run_extractor_background():
             pass
 
 
+def _events_count_path(events_path: pathlib.Path) -> pathlib.Path:
+    """Sidecar holding len(events) for an events_<h>.json file."""
+    return events_path.with_suffix('.count')
+
+
+def _write_events_atomic(path: pathlib.Path, events: list) -> None:
+    """Write a per-calendar events file and its .count sidecar atomically.
+
+    The sidecar is written after the JSON so its mtime is never older than
+    the data it describes; /admin/api/status reads it instead of parsing the
+    events file (files written by other tools simply have no fresh sidecar).
+    """
+    _dump_json_file(path, events)
+    try:
+        _atomic_write_bytes(_events_count_path(path), str(len(events)).encode('ascii'))
+    except Exception:
+        pass
+
+
+def _safe_unlink(path: pathlib.Path) -> None:
+    """os.unlink that ignores missing files (and other OS errors)."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# Parallelism for bulk deletes of capture files (matters on network storage)
+_UNLINK_MAX_WORKERS = 16
+
+
+def _remove_events_file(path: pathlib.Path) -> None:
+    """Delete an events_<h>.json file together with its .count sidecar."""
+    path.unlink(missing_ok=True)
+    _events_count_path(path).unlink(missing_ok=True)
+
+
+# ── Manual events: append-only log in front of playwright_captures/events.json ──
+# admin_add_event used to rewrite the whole (pretty-printed) events.json for
+# every new event. New events are now appended as one JSON line to
+# events.ndjson next to it and folded into events.json by the writer itself
+# (_materialize_events_json; additions are spliced on without parsing the
+# array). Deletions are logged as {"_deleted": {"uid": ...}} tombstones.
+# Every manual event carries a generated raw.uid, so tombstones and replays
+# match exactly that event, never an identical extractor event. Readers
+# never write: they merge whatever is still pending in memory
+# (_load_events_with_log), which costs a single stat when the log is empty.
+def _events_log_path(events_file: pathlib.Path) -> pathlib.Path:
+    return events_file.with_suffix('.ndjson')
+
+
+def _manual_event_uid(ev) -> Optional[str]:
+    raw = ev.get('raw') if isinstance(ev, dict) else None
+    return raw.get('uid') if isinstance(raw, dict) else None
+
+
+def _append_manual_event_log(ev: dict,
+                             events_file: pathlib.Path = pathlib.Path('playwright_captures/events.json')) -> None:
+    """Append one event (or tombstone) to the NDJSON log and fold it into events.json."""
+    import fcntl
+    log_path = _events_log_path(events_file)
+    log_path.parent.mkdir(exist_ok=True)
+    if orjson is not None:
+        line = orjson.dumps(ev, default=str) + b'\n'
+    else:
+        line = (json.dumps(ev, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+    fd = os.open(log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b'\n':
+            line = b'\n' + line  # don't glue onto a torn line from a crashed writer
+        os.write(fd, line)
+    finally:
+        os.close(fd)  # also releases the lock
+    try:
+        _materialize_events_json(events_file)
+    except Exception:
+        pass  # stays in the log: readers merge it, the next write retries
+
+
+def _parse_event_log(raw: bytes) -> list:
+    """Decode NDJSON log bytes; torn or garbled lines are skipped."""
+    pending = []
+    for line in raw.splitlines():
+        if line.strip():
+            try:
+                pending.append(json.loads(line))
+            except ValueError:
+                continue
+    return pending
+
+
+def _read_pending_event_log(events_file: pathlib.Path) -> list:
+    """Return the not-yet-folded log records without modifying anything."""
+    log_path = _events_log_path(events_file)
+    try:
+        if os.stat(log_path).st_size == 0:
+            return []
+    except OSError:
+        return []
+    import fcntl
+    try:
+        fd = os.open(log_path, os.O_RDONLY)
+    except OSError:
+        return []
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        raw = os.pread(fd, os.fstat(fd).st_size, 0)
+    finally:
+        os.close(fd)
+    return _parse_event_log(raw)
+
+
+def _apply_event_log(events: list, pending: list) -> list:
+    """Apply log records to `events` in place and return it.
+
+    Idempotent for uid-tagged records: an addition whose uid is already
+    present is skipped and a tombstone whose uid is gone is a no-op, so a
+    log replayed after a crash between the rewrite and the truncate does
+    not duplicate or over-delete anything.
+    """
+    present = {u for u in map(_manual_event_uid, events) if u}
+    for ev in pending:
+        if not isinstance(ev, dict):
+            continue
+        gone = ev.get('_deleted')
+        if gone is None:
+            uid = _manual_event_uid(ev)
+            if uid in present:
+                continue
+            if uid:
+                present.add(uid)
+            events.append(ev)
+            continue
+        if not isinstance(gone, dict):
+            continue
+        uid = gone.get('uid')
+        key = (gone.get('start'), gone.get('title'), gone.get('location'))
+        present.discard(uid)
+        for i in range(len(events) - 1, -1, -1):
+            e = events[i]
+            if not isinstance(e, dict):
+                continue
+            if uid:
+                hit = _manual_event_uid(e) == uid
+            else:
+                # legacy tombstone (logged before uids): manual events only
+                raw = e.get('raw')
+                hit = (isinstance(raw, dict) and raw.get('manual') is True
+                       and (e.get('start'), e.get('title'), e.get('location')) == key)
+            if hit:
+                del events[i]
+                break
+    return events
+
+
+def _load_events_with_log(events_file: pathlib.Path) -> Optional[list]:
+    """events.json with pending log records merged in memory (read-only).
+
+    Returns None when there is neither an events file nor a pending log.
+    """
+    pending = _read_pending_event_log(events_file)
+    if not events_file.exists():
+        return _apply_event_log([], pending) if pending else None
+    events = _load_json_file(events_file)
+    if not isinstance(events, list):
+        events = []
+    return _apply_event_log(events, pending) if pending else events
+
+
+def _materialize_events_json(events_file: pathlib.Path = pathlib.Path('playwright_captures/events.json')) -> None:
+    """Fold pending events.ndjson lines into events.json (atomic rewrite).
+
+    Write side only (the log appender, cleanup, the schedule rebuild).
+    events.json is replaced before the log is truncated; a crash in between
+    just replays the log, which _apply_event_log tolerates.
+    """
+    log_path = _events_log_path(events_file)
+    try:
+        if os.stat(log_path).st_size == 0:
+            return
+    except OSError:
+        return
+    import fcntl
+    fd = os.open(log_path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        _fold_event_log_locked(fd, events_file)
+    finally:
+        os.close(fd)
+
+
+def _fold_event_log_locked(fd: int, events_file: pathlib.Path) -> None:
+    """Body of _materialize_events_json; the caller holds the flock on `fd`."""
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return  # another worker already compacted it
+    pending = _parse_event_log(os.pread(fd, size, 0))
+    # Additions only: splice them onto the end of the existing array,
+    # minus any a crashed fold already spliced (those sit in the tail)
+    if pending and all(isinstance(ev, dict) and '_deleted' not in ev for ev in pending):
+        try:
+            if events_file.exists():
+                with open(events_file, 'rb') as f:
+                    f.seek(max(0, f.seek(0, os.SEEK_END) - 2 * size - 4096))
+                    tail = f.read()
+                new = [ev for ev in pending
+                       if not (_manual_event_uid(ev) and
+                               json.dumps(_manual_event_uid(ev)).encode() in tail)]
+                if not new or _append_json_array_file(events_file, new):
+                    os.ftruncate(fd, 0)
+                    return
+        except Exception:
+            pass
+    events = []
+    if events_file.exists():
+        try:
+            events = _load_json_file(events_file)
+        except Exception:
+            events = []
+    if not isinstance(events, list):
+        events = []
+    _dump_json_file(events_file, _apply_event_log(events, pending))
+    os.ftruncate(fd, 0)
+
+
+def _pop_events_json_index(index: int,
+                           events_file: pathlib.Path = pathlib.Path('playwright_captures/events.json')) -> Optional[bool]:
+    """Remove events.json[index] under the events.ndjson flock.
+
+    Pending log lines are folded first, so `index` refers to the same list
+    readers see, and no concurrent fold can land between the load and the
+    rewrite. Returns None if there is no events file, False if `index` is
+    out of range, True once the event is removed.
+    """
+    import fcntl
+    log_path = _events_log_path(events_file)
+    log_path.parent.mkdir(exist_ok=True)
+    fd = os.open(log_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        _fold_event_log_locked(fd, events_file)
+        if not events_file.exists():
+            return None
+        events = _load_json_file(events_file)
+        if index < 0 or index >= len(events):
+            return False
+        events.pop(index)
+        _dump_json_file(events_file, events)
+        return True
+    finally:
+        os.close(fd)
+
+
+# Serializes read-modify-write of calendar_map.json when several calendars
+# are extracted concurrently (see the daily prefetch).
+_calendar_map_lock = threading.Lock()
+
+
+def _mutate_calendar_map(fn, create: bool = False,
+                         map_path: pathlib.Path = pathlib.Path('playwright_captures') / 'calendar_map.json') -> bool:
+    """Read-modify-write calendar_map.json under _calendar_map_lock.
+
+    ``fn(cmap)`` edits the dict in place and returns True if it changed
+    anything; only then is the file rewritten (atomically). A missing map
+    counts as empty when ``create`` is set and is left alone otherwise.
+    Returns True if the file was written.
+    """
+    with _calendar_map_lock:
+        if map_path.exists():
+            cmap = _load_json_file(map_path)
+        elif create:
+            cmap = {}
+        else:
+            return False
+        if not fn(cmap):
+            return False
+        map_path.parent.mkdir(exist_ok=True)
+        _dump_json_file(map_path, cmap)
+        return True
+
+
+def _set_calendar_map_entry(h: str, url: str) -> None:
+    """Record an extracted calendar (name/color/building/room from the DB)."""
+    entry = {'url': url, 'name': '', 'color': None, 'building': None, 'room': None}
+    try:
+        init_db()
+        for r in list_calendar_urls():
+            if r.get('url') == url:
+                entry.update(name=r.get('name') or '', color=r.get('color'),
+                             building=r.get('building'), room=r.get('room'))
+                break
+    except Exception:
+        pass
+
+    def _put(cmap: dict) -> bool:
+        cmap[h] = entry
+        return True
+
+    _mutate_calendar_map(_put, create=True)
+
+
+# (utc flag) -> (epoch second, formatted); see _iso_now()
+_iso_now_cache: Dict[bool, tuple] = {}
+
+
+def _iso_now(utc: bool = False) -> str:
+    """Current time as ISO-8601 to the second, formatted at most once per second."""
+    sec = int(time.time())
+    hit = _iso_now_cache.get(utc)
+    if hit is None or hit[0] != sec:
+        hit = (sec, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec) if utc else time.localtime(sec)))
+        _iso_now_cache[utc] = hit
+    return hit[1]
+
+
+def _child_env(**overrides) -> Optional[dict]:
+    """Environment for child Python processes, forcing UTF-8 I/O.
+
+    Returns None (inherit os.environ as-is, no copy) when nothing needs to be
+    added, otherwise an overlay of os.environ with the missing keys.
+    """
+    extra = {k: v for k, v in (('PYTHONUTF8', '1'), ('PYTHONIOENCODING', 'utf-8'))
+             if k not in os.environ}
+    extra.update(overrides)
+    return {**os.environ, **extra} if extra else None
+
+
+# Admin-triggered single-calendar imports share a small pool; a URL that is
+# already queued or running is not submitted twice.
+_extract_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='extract')
+_extract_futures: Dict[str, Future] = {}
+_extract_futures_lock = threading.Lock()
+
+
+def _submit_url_extraction(url: str, calendar_name: str = None) -> Future:
+    """Queue _run_extractor_for_url(url) on the pool (deduplicated by URL)."""
+    with _extract_futures_lock:
+        fut = _extract_futures.get(url)
+        if fut is not None and not fut.done():
+            return fut
+        fut = _extract_pool.submit(_run_extractor_for_url, url, calendar_name)
+        _extract_futures[url] = fut
+
+    def _forget(f: Future) -> None:
+        with _extract_futures_lock:
+            if _extract_futures.get(url) is f:
+                del _extract_futures[url]
+
+    fut.add_done_callback(_forget)
+    return fut
+
+
 def _run_extractor_for_url(url: str, calendar_name: str = None, html_url: str = None) -> int:
     """Run the extractor script for a specific URL (uses CLI arg). Returns returncode.
 
@@ -1546,7 +2265,7 @@ def _run_extractor_for_url(url: str, calendar_name: str = None, html_url: str =
     """
     out_dir = pathlib.Path('playwright_captures')
     out_dir.mkdir(exist_ok=True)
-    h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+    h = _url_hash(url)
     stdout_path = out_dir / f'extract_{h}.stdout.txt'
     stderr_path = out_dir / f'extract_{h}.stderr.txt'
     
@@ -1612,38 +2331,14 @@ def _run_extractor_for_url(url: str, calendar_name: str = None, html_url: str =
 
                 # write per-calendar events file and mapping just like extractor would
                 try:
-                    h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+                    h = _url_hash(url)
                     out_dir = pathlib.Path('playwright_captures')
                     out_dir.mkdir(exist_ok=True)
                     ev_out = out_dir / f'events_{h}.json'
-                    with open(ev_out, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                    _write_events_atomic(ev_out, data)
                     # update calendar_map.json
                     try:
-                        map_path = out_dir / 'calendar_map.json'
-                        cmap = {}
-                        if map_path.exists():
-                            with open(map_path, 'r', encoding='utf-8') as mf:
-                                cmap = json.load(mf)
-                        name = None
-                        color = None
-                        building = None
-                        room = None
-                        try:
-                            init_db()
-                            rows = list_calendar_urls()
-                            for r in rows:
-                                if r.get('url') == url:
-                                    name = r.get('name')
-                                    color = r.get('color')
-                                    building = r.get('building')
-                                    room = r.get('room')
-                                    break
-                        except Exception:
-                            pass
-                        cmap[h] = {'url': url, 'name': name or '', 'color': color, 'building': building, 'room': room}
-                        with open(map_path, 'w', encoding='utf-8') as mf:
-                            json.dump(cmap, mf, indent=2, ensure_ascii=False)
+                        _set_calendar_map_entry(h, url)
                     except Exception:
                         pass
 
@@ -1668,16 +2363,12 @@ def _run_extractor_for_url(url: str, calendar_name: str = None, html_url: str =
     pw_url = html_url or url
     cmd = [sys.executable, str(pathlib.Path('tools') / 'extract_published_events.py'), pw_url]
     try:
-        # force UTF-8 for child process to avoid Windows cp1252 / OEM codepage problems
-        env = os.environ.copy()
-        env.setdefault('PYTHONUTF8', '1')
-        env.setdefault('PYTHONIOENCODING', 'utf-8')
+        # force UTF-8 for child process to avoid Windows cp1252 / OEM codepage problems.
         # Use a per-URL temp directory so concurrent/overlapping runs don't
         # clobber the shared events.json.
         tmp_out = out_dir / f'_tmp_{h}'
         tmp_out.mkdir(parents=True, exist_ok=True)
-        env['EXTRACT_OUTPUT_DIR'] = str(tmp_out)
-        env.setdefault('PYTHONIOENCODING', 'utf-8')
+        env = _child_env(EXTRACT_OUTPUT_DIR=str(tmp_out))
         with open(stdout_path, 'w', encoding='utf-8') as out_f, open(stderr_path, 'w', encoding='utf-8') as err_f:
             proc = subprocess.run(cmd, stdout=out_f, stderr=err_f, text=True, env=env)
             rc = proc.returncode
@@ -1751,38 +2442,13 @@ def _run_extractor_for_url(url: str, calendar_name: str = None, html_url: str =
 
             # write per-calendar events file
             try:
-                with open(ev_out, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                _write_events_atomic(ev_out, data)
             except Exception:
                 pass
 
             # update mapping file (hash -> url/name/color)
             try:
-                map_path = out_dir / 'calendar_map.json'
-                cmap = {}
-                if map_path.exists():
-                    with open(map_path, 'r', encoding='utf-8') as f:
-                        cmap = json.load(f)
-                # attempt to get name/color/building/room from DB
-                name = None
-                color = None
-                building = None
-                room = None
-                try:
-                    init_db()
-                    rows = list_calendar_urls()
-                    for r in rows:
-                        if r.get('url') == url:
-                            name = r.get('name')
-                            color = r.get('color')
-                            building = r.get('building')
-                            room = r.get('room')
-                            break
-                except Exception:
-                    pass
-                cmap[h] = {'url': url, 'name': name or '', 'color': color, 'building': building, 'room': room}
-                with open(map_path, 'w', encoding='utf-8') as f:
-                    json.dump(cmap, f, indent=2, ensure_ascii=False)
+                _set_calendar_map_entry(h, url)
             except Exception:
                 pass
 
@@ -1980,6 +2646,10 @@ def _init_background_tasks():
 def _ensure_background_tasks():
     """Lazily start background tasks on first request in each worker."""
     _init_background_tasks()
+    try:
+        init_db()
+    except Exception:
+        app.logger.exception('init_db failed')
 
 
 # ----------------- Daily DB cleanup -----------------
@@ -2014,7 +2684,6 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
                     try:
                         dt = datetime.fromisoformat(sid)
                     except Exception:
-                        from dateutil import parser as dtparser
                         dt = dtparser.parse(sid)
                     if dt.date() < cutoff_date:
                         ids_to_delete.append(r['id'])
@@ -2043,7 +2712,6 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
                     try:
                         d = date.fromisoformat(dstr)
                     except Exception:
-                        from dateutil import parser as dtparser
                         d = dtparser.parse(dstr).date()
                     if d < cutoff_date:
                         ids_to_delete.append(r['id'])
@@ -2063,6 +2731,7 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
         else:
             base = pathlib.Path('.')
         evfile = base / 'playwright_captures' / 'events.json'
+        _materialize_events_json(evfile)
         if evfile.exists():
             with open(evfile, 'r', encoding='utf-8') as f:
                 items = json.load(f)
@@ -2076,7 +2745,6 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
                     try:
                         dt = datetime.fromisoformat(s)
                     except Exception:
-                        from dateutil import parser as dtparser
                         dt = dtparser.parse(s)
                     if dt.date() < cutoff_date:
                         removed_from_file += 1
@@ -2120,7 +2788,6 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
                             try:
                                 dt = datetime.fromisoformat(s)
                             except Exception:
-                                from dateutil import parser as dtparser
                                 dt = dtparser.parse(s)
                             d = dt.date()
                             if d < cutoff_date or d > future_cutoff:
@@ -2131,11 +2798,10 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
                             kept.append(ev)
                     if len(kept) < len(items):
                         if kept:
-                            with open(p, 'w', encoding='utf-8') as f:
-                                json.dump(kept, f, indent=2, ensure_ascii=False, default=str)
+                            _write_events_atomic(p, kept)
                         else:
                             # no events left — remove the file entirely
-                            p.unlink()
+                            _remove_events_file(p)
                             calendar_files_removed += 1
                 except Exception:
                     continue
@@ -2152,59 +2818,75 @@ def cleanup_old_events(cutoff_days: int = 60, base_dir: str | pathlib.Path | Non
     }
 
 
-def read_rooms_publisher_csv():
-    """Return list of (url, name) from Rooms_PUBLISHER_HTML-ICS(in).csv in file order.
+_ROOMS_PUBLISHER_CSV = 'Rooms_PUBLISHER_HTML-ICS(in).csv'
 
-    Prefer the ICS column (index 5) then the HTML column (index 4). If a header
-    row is present (contains 'Published' or 'Nume_Sala'), it will be skipped.
-    Returns an empty list if CSV not found or parse fails.
-    """
-    csv_filename = 'Rooms_PUBLISHER_HTML-ICS(in).csv'
-    csv_candidates = [pathlib.Path(__file__).parent / 'config' / csv_filename,
-                      pathlib.Path(__file__).parent / csv_filename,
-                      pathlib.Path(csv_filename)]
-    csv_path = None
+
+def _find_rooms_publisher_csv() -> pathlib.Path | None:
+    """Return the first existing publisher CSV among the known locations."""
+    csv_candidates = [BASE_DIR / 'config' / _ROOMS_PUBLISHER_CSV,
+                      BASE_DIR / _ROOMS_PUBLISHER_CSV,
+                      pathlib.Path(_ROOMS_PUBLISHER_CSV)]
     for p in csv_candidates:
         try:
             if p.exists():
-                csv_path = p
-                break
+                return p
         except Exception:
             continue
-    if not csv_path:
-        return []
+    return None
 
-    import re
 
-    def _format_email_to_name(email: str) -> str:
-        """Turn publisher email local-part into a human-friendly display name.
+def _format_email_to_name(email: str) -> str:
+    """Turn publisher email local-part into a human-friendly display name.
 
-        Examples:
-          utcn_room_airi_obs_525@campus.utcluj.ro -> "UTCN AIRI OBS 525"
-        """
-        if not email:
-            return ''
-        try:
-            local = email.split('@', 1)[0]
-        except Exception:
-            local = email
-        # split on non-alnum separators (usually underscores)
-        parts = re.split(r'[^0-9A-Za-z]+', local)
-        parts = [p for p in parts if p]
-        # remove common filler token 'room'
-        parts = [p for p in parts if p.lower() != 'room']
-        if not parts:
-            return local
-        out_parts = []
-        for i, p in enumerate(parts):
-            if p.isdigit():
-                out_parts.append(p)
-            else:
-                # prefer full uppercase for short tokens like 'utcn', 'obs', 'aiei'
-                out_parts.append(p.upper())
-        return ' '.join(out_parts)
+    Examples:
+      utcn_room_airi_obs_525@campus.utcluj.ro -> "UTCN AIRI OBS 525"
+    """
+    if not email:
+        return ''
+    try:
+        local = email.split('@', 1)[0]
+    except Exception:
+        local = email
+    # split on non-alnum separators (usually underscores)
+    parts = re.split(r'[^0-9A-Za-z]+', local)
+    parts = [p for p in parts if p]
+    # remove common filler token 'room'
+    parts = [p for p in parts if p.lower() != 'room']
+    if not parts:
+        return local
+    out_parts = []
+    for i, p in enumerate(parts):
+        if p.isdigit():
+            out_parts.append(p)
+        else:
+            # prefer full uppercase for short tokens like 'utcn', 'obs', 'aiei'
+            out_parts.append(p.upper())
+    return ' '.join(out_parts)
 
-    out = []
+
+@functools.lru_cache(maxsize=4096)
+def _url_hash(url: str) -> str:
+    """Per-calendar file key: first 8 hex chars of SHA-1(url)."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_calendar_url(url: str) -> str:
+    """Key used to match calendar URLs against the publisher CSV map."""
+    return url.strip().rstrip('/').lower()
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_rooms_publisher_csv(csv_path: str, mtime_ns: int, size: int) -> tuple:
+    """Parse the publisher CSV once per (path, mtime, size).
+
+    Returns ``(rows, url_to_email, planned_order)`` where rows is a tuple of
+    ``(url, name, html_fallback)`` in file order and planned_order the
+    tuple of display names in that order. The stat fields are only
+    part of the cache key, so editing/uploading the CSV invalidates it.
+    """
+    rows = []
+    url_to_email = {}
     try:
         with open(csv_path, 'r', encoding='utf-8') as f:
             rdr = csv.reader(f)
@@ -2220,23 +2902,50 @@ def read_rooms_publisher_csv():
                     continue
                 # Prefer a display name derived from the publisher email (col 1).
                 # Fall back to the CSV human name (col 0) if email absent.
-                email = (row[1] or '').strip() if len(row) > 1 else ''
+                email = (row[1] or '').strip()
                 if email:
                     name = _format_email_to_name(email)
                 else:
                     name = (row[0] or '').strip()
-                html = (row[4] or '').strip() if len(row) > 4 else ''
-                ics = (row[5] or '').strip() if len(row) > 5 else ''
+                html = (row[4] or '').strip()
+                ics = (row[5] or '').strip()
+                for u in (html, ics):
+                    if not u:
+                        continue
+                    key = _normalize_calendar_url(u)
+                    url_to_email[key] = email
                 url = ics or html
                 if url:
                     # Return (primary_url, display_name, html_url) 3-tuples.
                     # html_url is the HTML calendar URL used as Playwright
                     # fallback when ICS parsing yields no events.
                     html_fallback = html if (html and url != html) else None
-                    out.append((url, name, html_fallback))
+                    rows.append((url, name, html_fallback))
     except Exception:
-        return []
-    return out
+        return (), {}, ()
+    return tuple(rows), url_to_email, tuple(name for _url, name, _html in rows)
+
+
+def _load_rooms_publisher_csv() -> tuple:
+    csv_path = _find_rooms_publisher_csv()
+    if not csv_path:
+        return (), {}, ()
+    try:
+        st = os.stat(csv_path)
+    except OSError:
+        return (), {}, ()
+    return _parse_rooms_publisher_csv(str(csv_path), st.st_mtime_ns, st.st_size)
+
+
+def read_rooms_publisher_csv():
+    """Return list of (url, name) from Rooms_PUBLISHER_HTML-ICS(in).csv in file order.
+
+    Prefer the ICS column (index 5) then the HTML column (index 4). If a header
+    row is present (contains 'Published' or 'Nume_Sala'), it will be skipped.
+    Returns an empty list if CSV not found or parse fails.
+    """
+    rows, _, _ = _load_rooms_publisher_csv()
+    return list(rows)
 
 
 def read_rooms_publisher_csv_map():
@@ -2246,45 +2955,17 @@ def read_rooms_publisher_csv_map():
     CSV not found or parse fails. This mirrors the candidate search used by
     read_rooms_publisher_csv().
     """
-    csv_filename = 'Rooms_PUBLISHER_HTML-ICS(in).csv'
-    csv_candidates = [pathlib.Path(__file__).parent / 'config' / csv_filename,
-                      pathlib.Path(__file__).parent / csv_filename,
-                      pathlib.Path(csv_filename)]
-    csv_path = None
-    for p in csv_candidates:
-        try:
-            if p.exists():
-                csv_path = p
-                break
-        except Exception:
-            continue
-    if not csv_path:
-        return {}
+    _, url_to_email, _ = _load_rooms_publisher_csv()
+    return dict(url_to_email)
+
+
+def read_rooms_publisher_planned_order() -> tuple:
+    """Return the CSV display names in extraction order (cached, immutable)."""
+    return _load_rooms_publisher_csv()[2]
 
-    out = {}
-    try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            rdr = csv.reader(f)
-            first = True
-            for row in rdr:
-                if first:
-                    first = False
-                    hdr = '|'.join(row).lower()
-                    if 'published' in hdr or 'nume_sala' in hdr or 'publishedcalendarurl' in hdr:
-                        continue
-                if not row or len(row) < 6:
-                    continue
-                email = (row[1] or '').strip()
-                html = (row[4] or '').strip() if len(row) > 4 else ''
-                ics = (row[5] or '').strip() if len(row) > 5 else ''
-                for u in (html, ics):
-                    if not u:
-                        continue
-                    key = u.strip().rstrip('/').lower()
-                    out[key] = email
-    except Exception:
-        return {}
-    return out
+
+# Number of calendars fetched concurrently by the daily prefetch
+_PREFETCH_MAX_WORKERS = int(os.environ.get('PREFETCH_MAX_WORKERS', 8))
 
 
 def _daily_cleanup_loop(cutoff_days: int = 60):
@@ -2324,15 +3005,20 @@ def _daily_cleanup_loop(cutoff_days: int = 60):
                         urls_with_names = []
 
                     any_ok = False
-                    for entry in urls_with_names:
-                        try:
-                            u, name = entry[0], entry[1]
-                            html_fallback = entry[2] if len(entry) >= 3 else None
-                            rc = _run_extractor_for_url(u, name, html_url=html_fallback)
-                            if rc == 0:
-                                any_ok = True
-                        except Exception:
-                            pass
+                    # Each extraction is network-bound, so overlap them with a
+                    # small thread pool instead of fetching calendars one by one.
+                    if urls_with_names:
+                        from concurrent.futures import ThreadPoolExecutor, as_completed
+                        with ThreadPoolExecutor(max_workers=min(_PREFETCH_MAX_WORKERS, len(urls_with_names))) as ex:
+                            futs = [ex.submit(_run_extractor_for_url, entry[0], entry[1],
+                                              html_url=entry[2] if len(entry) >= 3 else None)
+                                    for entry in urls_with_names]
+                            for fut in as_completed(futs):
+                                try:
+                                    if fut.result() == 0:
+                                        any_ok = True
+                                except Exception:
+                                    pass
 
                     # If any extraction succeeded, rebuild the schedule for the two-month window
                     if any_ok:
@@ -2387,7 +3073,7 @@ def calendars_json():
         for cal in calendars:
             url = cal.get('url', '')
             # Calculate hash the same way as in _run_extractor_for_url (SHA1, not MD5)
-            url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+            url_hash = _url_hash(url)
             result[url_hash] = {
                 'name': cal.get('name') or f"Calendar {cal.get('id')}",
                 'color': cal.get('color'),
@@ -2402,78 +3088,58 @@ def calendars_json():
     return jsonify({})
 
 
-@app.route('/events.json')
-def events_json():
-    """Return flattened events for FullCalendar or API clients.
+# ── Materialized schedule view ──
+# /events.json used to re-walk the nested schedule_by_room.json and re-run the
+# event parser on every request. Instead, the schedule is flattened once per
+# rebuild into the indexed `schedule_events` table and requests filter it in
+# SQLite. `schedule_events_meta` records which schedule file version the table
+# reflects so any worker can detect a stale table with a single stat.
+_schedule_events_lock = threading.Lock()
 
-    Query params: from, to, subject, professor
-    Always fetches and stores events for the next 2 months by default.
+_SCHEDULE_EVENT_COLUMNS = (
+    'title', 'display_title', 'start', 'end', 'room', 'building', 'subject',
+    'professor', 'location', 'color', 'source', 'calendar_name', 'year',
+    'group_name', 'group_display', 'day', 'schedule_room', 'search_lc',
+    'professor_lc', 'room_lc', 'schedule_room_lc',
+)
+
+
+def _flatten_schedule(schedule: dict, cmap: dict) -> List[Dict]:
+    """Flatten schedule_by_room.json into the event dicts served by /events.json.
+
+    Each dict also carries the helper keys (day, schedule_room, *_lc) used for
+    filtering; they are stripped before the events are returned to clients.
     """
-    # Import the event parser
     try:
-        from tools.event_parser import parse_event, parse_title, parse_location
+        from tools.event_parser import parse_event, parse_group_from_string
     except ImportError:
         parse_event = None
-        parse_title = None
-        parse_location = None
-    from_s = request.values.get('from')
-    to_s = request.values.get('to')
-    subject_filter = (request.values.get('subject') or '').strip().lower()
-    professor_filter = (request.values.get('professor') or '').strip().lower()
-    room_filter = (request.values.get('room') or '').strip().lower()
-    today = date.today()
-    
-    # Always ensure we have 2 months of events stored
-    two_months_from_now = today + timedelta(days=60)
-    
-    try:
-        from_date = date.fromisoformat(from_s) if from_s else today
-    except Exception:
-        from_date = today
-    try:
-        to_date = date.fromisoformat(to_s) if to_s else two_months_from_now
-    except Exception:
-        to_date = two_months_from_now
-
-    # ensure schedule exists
-    try:
-        jpath, cpath = ensure_schedule(from_date, to_date)
-    except Exception as exc:
-        # No schedule available yet - return empty array (not 500 error)
-        app.logger.warning('ensure_schedule failed: %s', exc)
-        return jsonify([])
-
-    if not jpath or not os.path.exists(jpath):
-        app.logger.warning('schedule file missing after ensure_schedule: %s', jpath)
-        return jsonify([])
-
-    # Use cached schedule data to avoid re-reading the JSON file on every request
-    schedule = _read_json_cached(str(jpath))
-    if schedule is None:
-        return jsonify([])
-
-    # Load calendar_map once (not per-event) using cached reader
-    _cmap_for_events = _read_json_cached(
-        str(pathlib.Path('playwright_captures') / 'calendar_map.json')
-    ) or {}
+        parse_group_from_string = None
 
     events = []
     for room, days in schedule.items():
         for day, evs in days.items():
             for e in evs:
-                start = e.get('start')
-                end = e.get('end')
                 title = e.get('title') or ''
-                location = e.get('location') or ''
-                
+
                 # Use event parser to extract structured data
                 parsed_subject = ''
                 parsed_prof = ''
                 parsed_building = ''
                 parsed_room = ''
                 display_title = title
-                
-                if parse_event:
+
+                # Fast path: build_schedule_by_room.py stores parse_event's
+                # output for the record under 'parsed' at build time, so only
+                # fall back to the parser for schedules written by older builds.
+                stored = e.get('parsed')
+                if isinstance(stored, dict):
+                    parsed_subject = stored.get('subject') or ''
+                    parsed_prof = stored.get('professor') or ''
+                    parsed_building = stored.get('building') or ''
+                    parsed_room = stored.get('room') or ''
+                    display_title = stored.get('display_title') or title
+                elif parse_event:
                     try:
                         parsed = parse_event(e)
                         parsed_subject = parsed.get('subject', '')
@@ -2483,74 +3149,194 @@ def events_json():
                         display_title = parsed.get('display_title', '') or title
                     except Exception:
                         pass
-                
+
                 # Fallback to existing data if parser didn't find anything
                 subject = parsed_subject or (e.get('subject') or '')
                 prof = parsed_prof or (e.get('professor') or '')
-                building = parsed_building or ''
                 room_parsed = parsed_room or room
 
-                hay = (title + ' ' + subject + ' ' + display_title).lower()
-                if subject_filter and subject_filter not in hay:
-                    continue
-                if professor_filter and professor_filter not in (prof or '').lower():
-                    continue
-                if room_filter and room_filter not in room.lower() and room_filter not in room_parsed.lower():
-                    continue
-
                 ev = {
                     'title': title,
                     'display_title': display_title,
-                    'start': start,
-                    'end': end,
-                    'room': room_parsed or room,
-                    'building': building,
+                    'start': e.get('start'),
+                    'end': e.get('end'),
+                    'room': room_parsed,
+                    'building': parsed_building or '',
                     'subject': subject,
                     'professor': prof,
-                    'location': location,
-                    'color': None,
-                    'source': e.get('source') if isinstance(e, dict) else None,
+                    'location': e.get('location') or '',
+                    'color': e.get('color') or None,
+                    'source': e.get('source'),
                     'calendar_name': None,
                     'year': '',
                     'group': '',
                     'group_display': '',
                 }
-                # resolve color and calendar_name from merged metadata or calendar_map
-                try:
-                    # if schedule already had a color (merged), preserve it
-                    if isinstance(e, dict) and e.get('color'):
-                        ev['color'] = e.get('color')
-
-                    src = ev.get('source')
-                    if src and src in _cmap_for_events:
-                        meta = _cmap_for_events.get(src) or {}
-                        if meta.get('color') and not ev['color']:
-                            ev['color'] = meta.get('color')
-                        if meta.get('name'):
-                            ev['calendar_name'] = meta.get('name')
-                except Exception:
-                    # ignore any errors resolving calendar metadata
-                    pass
+                # resolve color and calendar_name from calendar_map
+                meta = cmap.get(ev['source']) if ev['source'] else None
+                if isinstance(meta, dict):
+                    if meta.get('color') and not ev['color']:
+                        ev['color'] = meta.get('color')
+                    if meta.get('name'):
+                        ev['calendar_name'] = meta.get('name')
 
                 # Try to parse group/year from calendar_name or subject/display_title
-                try:
-                    from tools.event_parser import parse_group_from_string
-                    sample = ev.get('calendar_name') or ev.get('subject') or ev.get('display_title') or ''
-                    grp = parse_group_from_string(sample)
-                    if grp and isinstance(grp, dict):
-                        ev['year'] = grp.get('year', '')
-                        ev['group'] = grp.get('group', '')
-                        ev['group_display'] = grp.get('display', '')
-                except Exception:
-                    pass
+                if parse_group_from_string:
+                    try:
+                        sample = ev['calendar_name'] or subject or display_title or ''
+                        grp = parse_group_from_string(sample)
+                        if grp and isinstance(grp, dict):
+                            ev['year'] = grp.get('year', '')
+                            ev['group'] = grp.get('group', '')
+                            ev['group_display'] = grp.get('display', '')
+                    except Exception:
+                        pass
 
+                ev['day'] = day
+                ev['schedule_room'] = room
+                ev['search_lc'] = (title + ' ' + subject + ' ' + display_title).lower()
+                ev['professor_lc'] = prof.lower()
+                ev['room_lc'] = room_parsed.lower()
+                ev['schedule_room_lc'] = room.lower()
                 events.append(ev)
+    return events
+
 
-    # Append manual admin events from DB
+def _materialize_schedule_events(jpath, force: bool = False) -> bool:
+    """Load schedule_by_room.json into the `schedule_events` table if stale.
+
+    Returns True when the table reflects the current schedule file. The whole
+    replace runs in one IMMEDIATE transaction so concurrent workers never see
+    a half-written table and only one of them does the work.
+    """
+    try:
+        st = os.stat(jpath)
+    except OSError:
+        return False
+    version = f'{st.st_mtime_ns}:{st.st_size}'
+
+    with _schedule_events_lock:
+        with get_db_connection() as conn:
+            if not force:
+                row = conn.execute("SELECT value FROM schedule_events_meta WHERE key = 'schedule_version'").fetchone()
+                if row and row['value'] == version:
+                    return True
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute("SELECT value FROM schedule_events_meta WHERE key = 'schedule_version'").fetchone()
+                if row and row['value'] == version and not force:
+                    conn.rollback()
+                    return True
+                schedule = _load_json_file(jpath)
+                cmap = _read_json_cached(str(pathlib.Path('playwright_captures') / 'calendar_map.json')) or {}
+                flat = _flatten_schedule(schedule if isinstance(schedule, dict) else {}, cmap)
+                for ev in flat:
+                    ev['group_name'] = ev.pop('group')
+                conn.execute('DELETE FROM schedule_events')
+                conn.executemany(
+                    f"INSERT INTO schedule_events ({', '.join(_SCHEDULE_EVENT_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_SCHEDULE_EVENT_COLUMNS))})",
+                    [tuple(ev.get(c) for c in _SCHEDULE_EVENT_COLUMNS) for ev in flat])
+                conn.execute("INSERT OR REPLACE INTO schedule_events_meta (key, value) VALUES ('schedule_version', ?)",
+                             (version,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    return True
+
+
+def _query_schedule_events(from_date: date, to_date: date, subject_filter: str = '',
+                           professor_filter: str = '', room_filter: str = '') -> List[Dict]:
+    """Return flattened schedule events for the range, filtered inside SQLite.
+
+    Filters are lowercase substrings, matched with instr() against columns
+    lowercased at materialization time (same semantics as Python's `in`).
+    """
+    sql = ('SELECT title, display_title, start, end, room, building, subject, professor, '
+           'location, color, source, calendar_name, year, group_name, group_display '
+           'FROM schedule_events WHERE day BETWEEN ? AND ?')
+    params: list = [from_date.isoformat(), to_date.isoformat()]
+    if subject_filter:
+        sql += ' AND instr(search_lc, ?) > 0'
+        params.append(subject_filter)
+    if professor_filter:
+        sql += ' AND instr(professor_lc, ?) > 0'
+        params.append(professor_filter)
+    if room_filter:
+        sql += ' AND (instr(schedule_room_lc, ?) > 0 OR instr(room_lc, ?) > 0)'
+        params.extend((room_filter, room_filter))
+    sql += ' ORDER BY id'
+
+    events = []
+    with get_db_connection() as conn:
+        for row in conn.execute(sql, params):
+            ev = dict(row)
+            ev['group'] = ev.pop('group_name') or ''
+            ev['year'] = ev['year'] or ''
+            ev['group_display'] = ev['group_display'] or ''
+            events.append(ev)
+    return events
+
+
+def _filter_schedule_events(flat: List[Dict], from_date: date, to_date: date, subject_filter: str = '',
+                            professor_filter: str = '', room_filter: str = '') -> List[Dict]:
+    """In-Python equivalent of _query_schedule_events, used if SQLite fails."""
+    lo, hi = from_date.isoformat(), to_date.isoformat()
+    events = []
+    for ev in flat:
+        if not (lo <= ev['day'] <= hi):
+            continue
+        if subject_filter and subject_filter not in ev['search_lc']:
+            continue
+        if professor_filter and professor_filter not in ev['professor_lc']:
+            continue
+        if room_filter and room_filter not in ev['schedule_room_lc'] and room_filter not in ev['room_lc']:
+            continue
+        events.append({k: v for k, v in ev.items()
+                       if k not in ('day', 'schedule_room', 'search_lc', 'professor_lc', 'room_lc', 'schedule_room_lc')})
+    return events
+
+
+# Single-flight guard for /events.json: concurrent requests with the same
+# parameters wait for the first one's result instead of repeating the work.
+_events_inflight: Dict[tuple, Future] = {}
+_events_inflight_lock = threading.Lock()
+
+
+def _collect_events(from_date: date, to_date: date, subject_filter: str,
+                    professor_filter: str, room_filter: str) -> List[Dict]:
+    """Build the /events.json payload: schedule, manual and extracurricular events."""
+    # ensure schedule exists
+    try:
+        jpath, cpath = ensure_schedule(from_date, to_date)
+    except Exception as exc:
+        # No schedule available yet - return empty array (not 500 error)
+        app.logger.warning('ensure_schedule failed: %s', exc)
+        return []
+
+    if not jpath or not os.path.exists(jpath):
+        app.logger.warning('schedule file missing after ensure_schedule: %s', jpath)
+        return []
+
+    try:
+        if not _materialize_schedule_events(jpath):
+            return []
+        schedule_evs = _query_schedule_events(from_date, to_date, subject_filter, professor_filter, room_filter)
+    except Exception as exc:
+        # Fall back to filtering the cached schedule file in Python
+        app.logger.warning('schedule_events query failed, using file: %s', exc)
+        schedule = _read_json_cached(str(jpath))
+        if schedule is None:
+            return []
+        cmap = _read_json_cached(str(pathlib.Path('playwright_captures') / 'calendar_map.json')) or {}
+        schedule_evs = _filter_schedule_events(_flatten_schedule(schedule, cmap), from_date, to_date,
+                                               subject_filter, professor_filter, room_filter)
+
+    # Manual admin events from DB
+    manual_evs = []
     try:
-        init_db()
         manual = list_manual_events_db()
-        from dateutil import parser as dtparser
         for me in manual:
             try:
                 if not me.get('start'):
@@ -2575,17 +3361,16 @@ def events_json():
                     'color': '#004080',
                     'manual': True,
                 }
-                events.append(ev_obj)
+                manual_evs.append(ev_obj)
             except Exception:
                 continue
     except Exception:
         pass
 
-    # Append extracurricular events from DB so they appear in the calendar with a distinct color
+    # Extracurricular events from DB so they appear in the calendar with a distinct color
+    extra_evs = []
     try:
-        init_db()
         extra_events = list_extracurricular_db()
-        from dateutil import parser as dtparser
         for xe in extra_events:
             d = xe.get('date')
             if not d:
@@ -2602,8 +3387,8 @@ def events_json():
             else:
                 start_iso = ev_date.isoformat()
             try:
-                from tools.event_parser import parse_title
-                parsed = parse_title(xe.get('title', '') or '')
+                from tools.event_parser import parse_title_cached
+                parsed = parse_title_cached(xe.get('title', '') or '')
                 disp = parsed.display_title
                 subj = parsed.subject
             except Exception:
@@ -2621,18 +3406,127 @@ def events_json():
                 'color': '#7c3aed',  # purple for extracurricular
                 'extracurricular': True,
             }
-            events.append(ev_obj)
+            extra_evs.append(ev_obj)
     except Exception:
         pass
 
+    # Concatenate once: the schedule list (usually by far the largest) is
+    # extended in place instead of growing through the other sections.
+    events = schedule_evs
+    events += manual_evs
+    events += extra_evs
+    return events
+
+
+@app.route('/events.json')
+def events_json():
+    """Return flattened events for FullCalendar or API clients.
+
+    Query params: from, to, subject, professor, room
+    Always fetches and stores events for the next 2 months by default.
+    Schedule events are served from the `schedule_events` table, which is
+    refreshed whenever schedule_by_room.json changes.
+    """
+    from_s = request.values.get('from')
+    to_s = request.values.get('to')
+    subject_filter = (request.values.get('subject') or '').strip().lower()
+    professor_filter = (request.values.get('professor') or '').strip().lower()
+    room_filter = (request.values.get('room') or '').strip().lower()
+    today = date.today()
+    
+    # Always ensure we have 2 months of events stored
+    two_months_from_now = today + timedelta(days=60)
+    
+    try:
+        from_date = date.fromisoformat(from_s) if from_s else today
+    except Exception:
+        from_date = today
+    try:
+        to_date = date.fromisoformat(to_s) if to_s else two_months_from_now
+    except Exception:
+        to_date = two_months_from_now
+
+    key = (from_date, to_date, subject_filter, professor_filter, room_filter)
+    with _events_inflight_lock:
+        fut = _events_inflight.get(key)
+        leader = fut is None
+        if leader:
+            fut = Future()
+            _events_inflight[key] = fut
+    if not leader:
+        return jsonify(fut.result())
+
+    try:
+        events = _collect_events(from_date, to_date, subject_filter, professor_filter, room_filter)
+        fut.set_result(events)
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    finally:
+        with _events_inflight_lock:
+            _events_inflight.pop(key, None)
     return jsonify(events)
 
 
+# ── Export rendering: one long-lived Chromium instead of a launch per request ──
+# Playwright's sync API is bound to the thread that started it, so the browser
+# lives on a dedicated single-thread executor and request threads hand it
+# render jobs. Only that thread ever touches _export_pw / _export_browser.
+_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-render')
+_export_pw = None
+_export_browser = None
+
+
+def _render_export_page(html_path: pathlib.Path, out_path: pathlib.Path, fmt: str,
+                        print_background: bool = True) -> None:
+    """Render `html_path` to PDF or PNG using the shared browser (export thread only)."""
+    global _export_pw, _export_browser
+    if _export_browser is None or not _export_browser.is_connected():
+        from playwright.sync_api import sync_playwright
+        if _export_pw is None:
+            _export_pw = sync_playwright().start()
+        _export_browser = _export_pw.chromium.launch()
+    page = _export_browser.new_page()
+    try:
+        page.goto('file://' + str(html_path.resolve()))
+        # local file with inline styles: ready as soon as the DOM is parsed
+        page.wait_for_load_state('domcontentloaded')
+        if fmt == 'pdf':
+            page.pdf(path=str(out_path), format='A4', print_background=print_background)
+        else:
+            page.screenshot(path=str(out_path), full_page=True)
+    finally:
+        page.close()
+
+
+def _close_export_browser() -> None:
+    global _export_pw, _export_browser
+    try:
+        if _export_browser is not None:
+            _export_browser.close()
+        if _export_pw is not None:
+            _export_pw.stop()
+    except Exception:
+        pass
+    _export_browser = None
+    _export_pw = None
+
+
+@atexit.register
+def _shutdown_export_browser():
+    try:
+        _export_executor.submit(_close_export_browser).result(timeout=10)
+    except Exception:
+        pass
+    _export_executor.shutdown(wait=False)
+
+
 @app.route('/export_room')
 def export_room():
     """Render a printable timetable for a single room and optionally export to PDF/PNG.
 
-    Query params: room (required), from, to, format=pdf|png
+    Query params: room (required), from, to, format=pdf|png,
+    nobg=1 (PDF without cell backgrounds; faster to render)
     """
     room = (request.values.get('room') or '').strip()
     if not room:
@@ -2655,8 +3549,7 @@ def export_room():
     except Exception as e:
         return f'Failed to build schedule: {e}', 500
 
-    with open(jpath, 'r', encoding='utf-8') as f:
-        schedule = json.load(f)
+    schedule = _load_json_file(jpath)
 
     # collect events for room
     events = []
@@ -2693,7 +3586,7 @@ def export_room():
     # If client requested PDF/PNG, try to render with Playwright
     if fmt in ('pdf', 'png', 'jpg', 'jpeg'):
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.sync_api  # noqa: F401
         except Exception:
             return "Playwright is not available on the server; cannot export to PDF/image.", 500
 
@@ -2702,17 +3595,10 @@ def export_room():
         out_path = tmpd / ('room.pdf' if fmt == 'pdf' else 'room.png')
         with open(html_path, 'w', encoding='utf-8') as fh:
             fh.write(html)
+        print_background = request.values.get('nobg') != '1'
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                page.goto('file://' + str(html_path.resolve()))
-                page.wait_for_timeout(250)
-                if fmt == 'pdf':
-                    page.pdf(path=str(out_path), format='A4', print_background=True)
-                else:
-                    page.screenshot(path=str(out_path), full_page=True)
-                browser.close()
+            _export_executor.submit(_render_export_page, html_path, out_path, fmt,
+                                    print_background).result(timeout=120)
         except Exception as e:
             return f'Failed to render export: {e}', 500
 
@@ -2749,29 +3635,35 @@ def generate_events():
     return jsonify({'started': True, 'message': 'Extractor started'}), 202
 
 
+def _tail_file(path: str | None, n: int = 300) -> str:
+    """Return the last `n` bytes of a text file (empty string if unavailable).
+
+    Uses a single fstat + bounded pread so polling stays cheap even when the
+    extractor logs grow to several MB.
+    """
+    if not path:
+        return ''
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except Exception:
+        return ''
+    try:
+        size = os.fstat(fd).st_size
+        data = os.pread(fd, n, max(0, size - n))
+        return data.decode('utf-8', 'replace')
+    except Exception:
+        return ''
+    finally:
+        os.close(fd)
+
+
 @app.route('/generate_status')
 def generate_status():
     """Return current extractor status and small tails of logs."""
     state = dict(extractor_state)
     # attach small tails of logs if available
-    try:
-        if state.get('stdout_path') and os.path.exists(state['stdout_path']):
-            with open(state['stdout_path'], 'r', encoding='utf-8') as f:
-                data = f.read()
-                state['stdout_tail'] = data[-300:]
-        else:
-            state['stdout_tail'] = ''
-    except Exception:
-        state['stdout_tail'] = ''
-    try:
-        if state.get('stderr_path') and os.path.exists(state['stderr_path']):
-            with open(state['stderr_path'], 'r', encoding='utf-8') as f:
-                data = f.read()
-                state['stderr_tail'] = data[-300:]
-        else:
-            state['stderr_tail'] = ''
-    except Exception:
-        state['stderr_tail'] = ''
+    state['stdout_tail'] = _tail_file(state.get('stdout_path'))
+    state['stderr_tail'] = _tail_file(state.get('stderr_path'))
 
     return jsonify(state)
 
@@ -2790,7 +3682,7 @@ def download_file(filename: str):
         try:
             if p.exists() and p.is_file():
                 # ensure file is inside repository (avoid absolute unexpected paths)
-                repo_root = pathlib.Path(__file__).parent.resolve()
+                repo_root = BASE_DIR.resolve()
                 try:
                     resolved = p.resolve()
                 except Exception:
@@ -2821,31 +3713,35 @@ def saved_response(fname: str):
     return "Not found", 404
 
 
+# Building map for the departures dropdown (code -> display name).
+# Template expects a mapping so it can call `buildings.items()` and `buildings.get()`.
+_DEPARTURE_BUILDINGS = {
+    'baritiu': 'Baritiu',
+    'daic': 'DAIC',
+    'dorobantilor': 'Dorobantilor',
+    'observatorului': 'Observatorului',
+    'memorandumului': 'Memorandumului',
+}
+# building display name -> lowercase code, filled lazily by departures_view
+_BUILDING_CODE_CACHE: Dict[str, str] = {name: code for code, name in _DEPARTURE_BUILDINGS.items()}
+
+
 @app.route('/departures')
 def departures_view():
     """Departure board style view - shows today's and tomorrow's classes by building."""
-    from dateutil import parser as dtparser
     
     # Add tools directory to path for imports
-    tools_dir = pathlib.Path(__file__).parent / 'tools'
+    tools_dir = BASE_DIR / 'tools'
     if str(tools_dir) not in sys.path:
         sys.path.insert(0, str(tools_dir))
     
     try:
-        from event_parser import parse_location, parse_title, parse_event
+        from event_parser import parse_location_cached, parse_title_cached
     except ImportError:
-        from tools.event_parser import parse_location, parse_title, parse_event
-    
-    # Building map for the dropdown (code -> display name)
-    # Template expects a mapping so it can call `buildings.items()` and `buildings.get()`.
-    BUILDINGS = {
-        'baritiu': 'Baritiu',
-        'daic': 'DAIC',
-        'dorobantilor': 'Dorobantilor',
-        'observatorului': 'Observatorului',
-        'memorandumului': 'Memorandumului',
-    }
+        from tools.event_parser import parse_location_cached, parse_title_cached
     
+    BUILDINGS = _DEPARTURE_BUILDINGS
+
     # Get selected building from query params (default: show all)
     selected_building = request.args.get('building', '').lower()
     
@@ -2859,8 +3755,7 @@ def departures_view():
                              current_time=datetime.now(),
                              error="No events file found. Please go to Admin to import a calendar.")
     
-    with open(events_file, 'r', encoding='utf-8') as f:
-        all_events = json.load(f)
+    all_events = _load_events_with_log(events_file)
 
     # Deduplicate loaded events by ItemId or title+start to avoid duplicates showing in Live
     try:
@@ -2886,7 +3781,6 @@ def departures_view():
 
     # Also append extracurricular events persisted in DB so they appear on the departure board
     try:
-        init_db()
         extra_events = list_extracurricular_db()
         for xe in extra_events:
             d = xe.get('date')
@@ -2916,9 +3810,10 @@ def departures_view():
     today = now.date()
     tomorrow = today + timedelta(days=1)
     
-    # Parse and filter events for today and tomorrow
-    events_today = defaultdict(list)
-    events_tomorrow = defaultdict(list)
+    # Parse and filter events for today and tomorrow into flat
+    # (building, start, event_info) rows; grouped after a single sort below.
+    today_rows = []
+    tomorrow_rows = []
     has_today_events = False
     
     for ev in all_events:
@@ -2975,9 +3870,11 @@ def departures_view():
         
         # Parse location
         location = ev.get('location') or ''
-        parsed_loc = parse_location(location)
+        parsed_loc = parse_location_cached(location)
         building_name = parsed_loc.get('building', '') or 'Other'
-        building_code = building_name.lower() if building_name else 'other'
+        building_code = _BUILDING_CODE_CACHE.get(building_name)
+        if building_code is None:
+            building_code = _BUILDING_CODE_CACHE.setdefault(building_name, building_name.lower())
         room = parsed_loc.get('room', '') or ''
         
         # Filter by building if selected
@@ -2986,7 +3883,7 @@ def departures_view():
         
         # Parse title
         title = ev.get('title') or ''
-        parsed_title = parse_title(title)
+        parsed_title = parse_title_cached(title)
         
         # Build event info
         event_info = {
@@ -3008,20 +3905,18 @@ def departures_view():
         }
         
         if event_date == today:
-            events_today[building_name].append(event_info)
+            today_rows.append((building_name, start_dt, event_info))
             has_today_events = True
         else:
-            events_tomorrow[building_name].append(event_info)
-    
-    # Sort events by start time within each building
-    for building in events_today:
-        events_today[building].sort(key=lambda x: x['start'])
-    for building in events_tomorrow:
-        events_tomorrow[building].sort(key=lambda x: x['start'])
+            tomorrow_rows.append((building_name, start_dt, event_info))
     
-    # Sort buildings alphabetically
-    events_today = dict(sorted(events_today.items()))
-    events_tomorrow = dict(sorted(events_tomorrow.items()))
+    # One sort by (building, start) orders buildings alphabetically and
+    # events by start time within each building; groupby then splits it.
+    by_building_start = itemgetter(0, 1)
+    today_rows.sort(key=by_building_start)
+    tomorrow_rows.sort(key=by_building_start)
+    events_today = {b: [r[2] for r in g] for b, g in groupby(today_rows, key=itemgetter(0))}
+    events_tomorrow = {b: [r[2] for r in g] for b, g in groupby(tomorrow_rows, key=itemgetter(0))}
     
     # Combine into structure for template
     events_by_day = {}
@@ -3070,14 +3965,291 @@ def admin_cleanup_old_events():
         return jsonify({'error': str(e)}), 500
 
 
+# ── Cached event counts for /admin/api/status ──
+# The admin UI polls every few seconds; instead of json.load()-ing every
+# events_*.json (plus events.json and schedule_by_room.json) on each poll we
+# remember the count per file and only re-parse when (mtime_ns, size) change.
+_events_count_cache: Dict[str, tuple] = {}
+
+
+def _count_events(path: pathlib.Path, st: os.stat_result | None = None) -> Optional[int]:
+    """Return the number of events stored in a JSON file, or None if unreadable.
+
+    Lists count their items; schedule_by_room-style dicts (room -> day ->
+    [events]) count the events of every room/day.
+    """
+    key = str(path)
+    try:
+        if st is None:
+            st = os.stat(key)
+    except OSError:
+        _events_count_cache.pop(key, None)
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _events_count_cache.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    count = None
+    # Sidecar written by _write_events_atomic(); only trusted when it is at
+    # least as new as the events file (other tools write JSON without one).
+    try:
+        cpath = _events_count_path(pathlib.Path(key))
+        if os.stat(cpath).st_mtime_ns >= st.st_mtime_ns:
+            count = int(cpath.read_text(encoding='ascii'))
+    except (OSError, ValueError):
+        count = None
+    if count is None:
+        try:
+            count = _fast_count_json_array(key)
+        except Exception:
+            count = None
+    _events_count_cache[key] = (sig, count)
+    return count
+
+
+def _count_schedule_days(days) -> int:
+    count = 0
+    if isinstance(days, dict):
+        for evs in days.values():
+            if isinstance(evs, list):
+                count += len(evs)
+    return count
+
+
+def _fast_count_json_array(path: str) -> int:
+    """Count the events in a JSON file without keeping the parsed data.
+
+    With ijson (C backend) the file is streamed: top-level arrays are counted
+    item by item and schedule dicts one room at a time, so memory stays flat
+    regardless of file size. Otherwise falls back to a full (orjson) parse.
+    """
+    if ijson is not None:
+        with open(path, 'rb', buffering=_JSON_READ_BUFSIZE) as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == b'[':
+                return sum(1 for _ in ijson.items(f, 'item', buf_size=_JSON_READ_BUFSIZE))
+            if first == b'{':
+                return sum(_count_schedule_days(days)
+                           for _room, days in ijson.kvitems(f, '', buf_size=_JSON_READ_BUFSIZE))
+            return 0
+    data = _load_json_file(path)
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        return sum(_count_schedule_days(days) for days in data.values())
+    return 0
+
+
+def _scan_event_files(out_dir: pathlib.Path) -> list:
+    """Return [(path, stat, count)] for every events_*.json in out_dir."""
+    stats = []
+    seen = set()
+    try:
+        entries = os.scandir(out_dir)
+    except OSError:
+        return []
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith('events_') and name.endswith('.json')):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            ef = out_dir / name
+            seen.add(str(ef))
+            stats.append((ef, st))
+    # Cold cache (e.g. right after an upload): count the changed files from a
+    # small pool, file reads release the GIL. Warm polls stay sequential.
+    misses = []
+    for ef, st in stats:
+        cached = _events_count_cache.get(str(ef))
+        if cached is None or cached[0] != (st.st_mtime_ns, st.st_size):
+            misses.append((ef, st))
+    if len(misses) >= 4:
+        with ThreadPoolExecutor(max_workers=min(16, len(misses))) as ex:
+            list(ex.map(lambda m: _count_events(*m), misses))
+    rows = [(ef, st, _count_events(ef, st)) for ef, st in stats]
+    # forget files that were deleted since the last scan
+    prefix = str(out_dir / 'events_')
+    for key in [k for k in _events_count_cache if k.startswith(prefix) and k not in seen]:
+        _events_count_cache.pop(key, None)
+    return rows
+
+
+# Liveness of a detached extractor run, re-checked at most once per
+# _DETACHED_CHECK_TTL seconds (pidfile read + os.kill(pid, 0)).
+_DETACHED_CHECK_TTL = 1.0
+_detached_check = {'pid': None, 'alive': False, 'ts': 0.0}
+
+
+_detached_check_lock = threading.Lock()
+# (pid, pidfd) of the detached run spawned by this worker, if any
+_detached_pidfd = None
+
+
+def _popen_detached(cmd: list, out_path: pathlib.Path, err_path: pathlib.Path, **kwargs) -> subprocess.Popen:
+    """Start ``cmd`` in its own session with stdout/stderr appended to the logs.
+
+    The log files are opened as raw O_APPEND descriptors and closed again
+    right after the fork, so the worker holds no handle for the child's
+    lifetime.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    out_fd = os.open(out_path, flags, 0o644)
+    try:
+        err_fd = os.open(err_path, flags, 0o644)
+        try:
+            return subprocess.Popen(cmd, stdout=out_fd, stderr=err_fd,
+                                    start_new_session=True, close_fds=True, **kwargs)
+        finally:
+            os.close(err_fd)
+    finally:
+        os.close(out_fd)
+
+
+def _track_detached_process(pid: int) -> None:
+    """Keep a pidfd for a detached run this worker spawned (Linux 5.3+).
+
+    Exit is then detected with a zero-timeout select() on the fd, which also
+    works while the child is an unreaped zombie (os.kill(pid, 0) still
+    succeeds on zombies). Other workers fall back to the pidfile check.
+    """
+    global _detached_pidfd
+    _release_detached_pidfd()
+    pidfd_open = getattr(os, 'pidfd_open', None)
+    if pidfd_open is None:
+        return
+    try:
+        _detached_pidfd = (int(pid), pidfd_open(int(pid), 0))
+    except OSError:
+        pass
+
+
+def _release_detached_pidfd() -> None:
+    global _detached_pidfd
+    tracked, _detached_pidfd = _detached_pidfd, None
+    if tracked is not None:
+        try:
+            os.close(tracked[1])
+        except OSError:
+            pass
+
+
+def _pidfd_exited(pid: int) -> Optional[bool]:
+    """True/False if `pid` is tracked by a pidfd, None if it is not."""
+    tracked = _detached_pidfd
+    if not tracked or tracked[0] != int(pid):
+        return None
+    import select
+    fd = tracked[1]
+    try:
+        readable, _, _ = select.select([fd], [], [], 0)
+    except (OSError, ValueError):
+        return None
+    if not readable:
+        return False
+    # exited: reap our child and release the fd
+    try:
+        os.waitpid(int(pid), os.WNOHANG)
+    except ChildProcessError:
+        pass
+    _release_detached_pidfd()
+    return True
+
+
+def _check_detached_extractor(force: bool = False) -> tuple:
+    """Return (pid, alive) for the detached extractor started by an upload.
+
+    The pid comes from extractor_state or, failing that, the pidfile. A dead
+    process has its pidfile and state entry removed. Serialized so concurrent
+    requests do not race on the pidfile; `force` bypasses the TTL.
+    """
+    with _detached_check_lock:
+        now = time.monotonic()
+        pid = extractor_state.get('detached_pid')
+        if (not force and now - _detached_check['ts'] < _DETACHED_CHECK_TTL
+                and (not pid or pid == _detached_check['pid'])):
+            return _detached_check['pid'], _detached_check['alive']
+
+        if not pid:
+            try:
+                pid = int(PIDFILE.read_text(encoding='utf-8').strip())
+            except Exception:
+                pid = None
+
+        alive = False
+        if pid:
+            try:
+                exited = _pidfd_exited(pid)
+                if exited:
+                    raise ProcessLookupError(pid)
+                if exited is None:
+                    # Check process aliveness; os.kill(pid, 0) raises OSError if not alive
+                    os.kill(int(pid), 0)
+                alive = True
+            except Exception:
+                # process not running any more -> cleanup pidfile and state
+                _safe_unlink(PIDFILE)
+                extractor_state.pop('detached_pid', None)
+        _detached_check.update(pid=pid, alive=alive, ts=now)
+        return pid, alive
+
+
+def _forget_detached_extractor() -> None:
+    """Drop the pidfile/state of a detached run that was just stopped."""
+    with _detached_check_lock:
+        _safe_unlink(PIDFILE)
+        extractor_state.pop('detached_pid', None)
+        _release_detached_pidfd()
+        _detached_check.update(pid=None, alive=False, ts=time.monotonic())
+
+
+# Short-lived shared response for /admin/api/status: several admin tabs
+# polling at once cost one computation per window. The payload does not
+# depend on which admin is asking.
+_STATUS_CACHE_TTL = float(os.environ.get('ADMIN_STATUS_CACHE_TTL', 0.5))
+_status_cache = {'ts': 0.0, 'body': None}
+_status_cache_lock = threading.Lock()
+
+
 @app.route('/admin/api/status', methods=['GET'])
 @require_admin
 def admin_api_status():
     """API endpoint returning admin status for React frontend."""
+    body = _status_cache['body']
+    if body is None or time.monotonic() - _status_cache['ts'] >= _STATUS_CACHE_TTL:
+        with _status_cache_lock:
+            body = _status_cache['body']
+            if body is None or time.monotonic() - _status_cache['ts'] >= _STATUS_CACHE_TTL:
+                body = _build_admin_status().get_data()
+                _status_cache['body'] = body
+                _status_cache['ts'] = time.monotonic()
+    resp = Response(body, mimetype='application/json')
+    resp.headers['Cache-Control'] = 'private, max-age=0'
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+
+def _build_admin_status():
+    """Compute the /admin/api/status payload (as a JSON response)."""
     calendars = []
     manual_events = []
     events_count = 0
+    sch_count = 0
+    events_file_count = 0
+    extracount = 0
     last_import = None
+    out_dir = pathlib.Path('playwright_captures')
+    # filesystem-derived progress, filled by the single events_*.json sweep below
+    files_count = 0
+    nonzero_count = 0
+    last_written = None
+    last_written_mtime = None
     
     try:
         init_db()
@@ -3091,7 +4263,7 @@ def admin_api_status():
             for cal in calendars:
                 try:
                     url = (cal.get('url') or '')
-                    key = url.strip().rstrip('/').lower() if url else ''
+                    key = _normalize_calendar_url(url) if url else ''
                     # prefer existing DB value (if present), otherwise fall back to CSV map
                     existing = cal.get('email_address') or None
                     if not existing:
@@ -3103,66 +4275,44 @@ def admin_api_status():
             pass
         manual_events = list_manual_events_db()
         
-        # Get events count from all events_*.json files
-        out_dir = pathlib.Path('playwright_captures')
-        event_files = list(out_dir.glob('events_*.json'))
-        for ef in event_files:
-            try:
-                with open(ef, 'r', encoding='utf-8') as f:
-                    events = json.load(f)
-                    events_count += len(events)
-                # Track latest import time
-                mtime = ef.stat().st_mtime
-                if last_import is None or mtime > last_import:
-                    last_import = mtime
-            except Exception:
-                pass
-        
-        # Also check main events.json if it exists (fallback)
-        events_file = pathlib.Path('playwright_captures/events.json')
-        if events_file.exists() and not event_files:
-            try:
-                with open(events_file, 'r', encoding='utf-8') as f:
-                    events = json.load(f)
-                    events_count = len(events)
-                last_import = events_file.stat().st_mtime
-            except Exception:
-                pass
-        # Also include events from schedule_by_room.json (aggregated schedule)
-        schedule_file = pathlib.Path('playwright_captures/schedule_by_room.json')
-        sch_count = 0
-        try:
-            if schedule_file.exists():
-                with open(schedule_file, 'r', encoding='utf-8') as f:
-                    schedule = json.load(f)
-                # schedule_by_room.json is a map room -> day -> [events]
-                for room, days in (schedule.items() if isinstance(schedule, dict) else []):
-                    try:
-                        for day, evs in (days.items() if isinstance(days, dict) else []):
-                            if isinstance(evs, list):
-                                sch_count += len(evs)
-                    except Exception:
-                        continue
-                mtime = schedule_file.stat().st_mtime
-                if last_import is None or mtime > last_import:
-                    last_import = mtime
-        except Exception:
-            sch_count = 0
+        # One sweep over events_*.json: events count plus the filesystem
+        # progress counters (counts are cached per file and only recomputed
+        # when the file changes)
+        file_stats = _scan_event_files(out_dir)
+        files_count = len(file_stats)
+        for ef, st, n in file_stats:
+            if n is None:
+                continue
+            events_count += n
+            if n > 0:
+                nonzero_count += 1
+            # Track latest import time / most recently written file
+            if last_import is None or st.st_mtime > last_import:
+                last_import = st.st_mtime
+            if last_written_mtime is None or st.st_mtime >= last_written_mtime:
+                last_written_mtime = st.st_mtime
+                last_written = ef.name
 
-        # Also check global events.json (fallback) and compute counts there
-        events_file = pathlib.Path('playwright_captures/events.json')
-        events_file_count = 0
-        try:
-            if events_file.exists():
-                with open(events_file, 'r', encoding='utf-8') as f:
-                    evs = json.load(f)
-                if isinstance(evs, list):
-                    events_file_count = len(evs)
-                mtime = events_file.stat().st_mtime
-                if last_import is None or mtime > last_import:
-                    last_import = mtime
-        except Exception:
-            events_file_count = 0
+        # Also include events from schedule_by_room.json (aggregated schedule)
+        # and the global events.json (fallback); both are list/dict shapes
+        # handled by _count_events.
+        for fname in ('schedule_by_room.json', 'events.json'):
+            fpath = out_dir / fname
+            try:
+                st = fpath.stat()
+            except OSError:
+                continue
+            n = _count_events(fpath, st)
+            if n is None:
+                continue
+            if fname == 'events.json':
+                if _read_pending_event_log(fpath):
+                    n = len(_load_events_with_log(fpath))
+                events_file_count = n
+            else:
+                sch_count = n
+            if last_import is None or st.st_mtime > last_import:
+                last_import = st.st_mtime
 
         # manual/extracurricular events from DB are additional sources
         extracount = 0
@@ -3190,98 +4340,34 @@ def admin_api_status():
     # provide a lightweight CSV preview by reading the canonical publisher CSV
     # so the admin UI can show the planned extraction order without starting
     # an extractor run.
-    planned = extractor_state.get('planned_order')
-    if not planned:
-        try:
-            rows = read_rooms_publisher_csv()
-            planned = [name for (_url, name) in rows]
-        except Exception:
-            planned = []
-
-    # Read full stdout/stderr files for the extractor (if present).
-    stdout_text = None
-    stderr_text = None
-    try:
-        out_path = pathlib.Path(__file__).parent / 'playwright_captures' / 'extract_stdout.txt'
-        if out_path.exists():
-            try:
-                with open(out_path, 'r', encoding='utf-8', errors='replace') as f:
-                    stdout_text = f.read()
-            except Exception:
-                stdout_text = None
-    except Exception:
-        stdout_text = None
-    try:
-        err_path = pathlib.Path(__file__).parent / 'playwright_captures' / 'extract_stderr.txt'
-        if err_path.exists():
-            try:
-                with open(err_path, 'r', encoding='utf-8', errors='replace') as f:
-                    stderr_text = f.read()
-            except Exception:
-                stderr_text = None
-    except Exception:
-        stderr_text = None
+    planned = extractor_state.get('planned_order')
+    if not planned:
+        try:
+            planned = read_rooms_publisher_planned_order()
+        except Exception:
+            planned = []
 
     # If a detached extractor subprocess was launched, detect it via the
     # saved pid (in-memory or on-disk) so the admin UI reports running while
     # the external process is still active.
     extractor_running = extractor_state.get('running', False)
-    detached_pid = extractor_state.get('detached_pid')
-    pidfile = pathlib.Path(__file__).parent / 'playwright_captures' / 'extract_detached.pid'
-    if not detached_pid:
-        try:
-            if pidfile.exists():
-                try:
-                    detached_pid = int(pidfile.read_text(encoding='utf-8').strip())
-                except Exception:
-                    detached_pid = None
-        except Exception:
-            detached_pid = None
-
-    if detached_pid:
-        try:
-            # Check process aliveness; os.kill(pid, 0) raises OSError if not alive
-            os.kill(int(detached_pid), 0)
-            extractor_running = True
-            if not extractor_state.get('progress_message'):
-                extractor_state['progress_message'] = f'Detached extraction (pid {detached_pid}) running'
-        except Exception:
-            # process not running any more -> cleanup pidfile and state
-            try:
-                if pidfile.exists():
-                    pidfile.unlink()
-            except Exception:
-                pass
-            extractor_state.pop('detached_pid', None)
+    detached_pid, detached_alive = _check_detached_extractor()
+    if detached_alive:
+        extractor_running = True
+        if not extractor_state.get('progress_message'):
+            extractor_state['progress_message'] = f'Detached extraction (pid {detached_pid}) running'
 
     # Provide filesystem-derived progress so the admin UI isn't stuck when the
     # extractor is running as a detached external process (which doesn't update
     # the in-memory extractor_state). We compute how many per-calendar files
-    # have been written and how many contain events.
+    # have been written and how many contain events (computed above).
+    # Always update filesystem-derived counters so the admin UI shows
+    # accurate, up-to-date numbers immediately after uploads or during
+    # detached extraction runs.
     try:
-        files = list(out_dir.glob('events_*.json')) if out_dir.exists() else []
-        files_sorted = sorted(files, key=lambda p: p.stat().st_mtime)
-        files_count = len(files_sorted)
-        nonzero_count = 0
-        last_written = None
-        for p in files_sorted:
-            try:
-                with open(p, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list) and len(data) > 0:
-                        nonzero_count += 1
-                last_written = p.name
-            except Exception:
-                continue
-        # Always update filesystem-derived counters so the admin UI shows
-        # accurate, up-to-date numbers immediately after uploads or during
-        # detached extraction runs.
-        try:
-            extractor_state['fs_events_count'] = files_count
-            extractor_state['fs_events_nonzero'] = nonzero_count
-            extractor_state['fs_last_written'] = last_written
-        except Exception:
-            pass
+        extractor_state['fs_events_count'] = files_count
+        extractor_state['fs_events_nonzero'] = nonzero_count
+        extractor_state['fs_last_written'] = last_written
     except Exception:
         pass
 
@@ -3289,17 +4375,16 @@ def admin_api_status():
     # precise per-calendar progress (total / succeeded / failed / files_count)
     import_progress = None
     try:
-        prog_path = pathlib.Path(__file__).parent / 'playwright_captures' / 'import_progress.json'
+        prog_path = PROG_PATH
         if prog_path.exists():
             try:
-                with open(prog_path, 'r', encoding='utf-8') as pf:
-                    import_progress = json.load(pf)
+                import_progress = _load_json_file(prog_path)
             except Exception:
                 import_progress = None
     except Exception:
         import_progress = None
 
-    return jsonify({
+    return _json_response({
         'calendars': calendars,
         'manual_events': manual_events,
         'events_count': events_count,
@@ -3333,7 +4418,7 @@ def admin_api_status():
             'last_success': periodic_fetch_state.get('last_success'),
             'interval_minutes': 60
         }
-    })
+    }, sort_keys=False)
 
 
 @app.route('/admin/set_calendar_url', methods=['POST'])
@@ -3381,8 +4466,7 @@ def admin_set_calendar_url():
 
     # Immediately start importing events from this calendar in background
     if url and not extractor_state.get('running'):
-        t = threading.Thread(target=_run_extractor_for_url, args=(url,), daemon=True)
-        t.start()
+        _submit_url_extraction(url)
         import_started = True
     else:
         import_started = False
@@ -3422,7 +4506,7 @@ def admin_upload_rooms_publisher():
 
         # Try to write into config/ (backup existing first)
         try:
-            cfg_dir = pathlib.Path(__file__).parent / 'config'
+            cfg_dir = BASE_DIR / 'config'
             cfg_dir.mkdir(exist_ok=True)
             target = cfg_dir / csv_filename
             # backup existing file if present
@@ -3442,41 +4526,32 @@ def admin_upload_rooms_publisher():
         except Exception:
             pass
 
-        # Also save to playwright_captures/ for backward compatibility (backup existing)
-        try:
-            pc_dir = pathlib.Path(__file__).parent / 'playwright_captures'
-            pc_dir.mkdir(exist_ok=True)
-            target2 = pc_dir / csv_filename
-            try:
-                if target2.exists():
-                    bak2 = pc_dir / f"{csv_filename}.bak.{int(time.time())}"
-                    target2.replace(bak2)
-            except Exception:
-                pass
-            tmp2 = pc_dir / f".{csv_filename}.tmp"
-            with open(tmp2, 'wb') as out:
-                out.write(content)
-            tmp2.replace(target2)
-            saved.append(str(target2))
-        except Exception:
-            pass
-
-        # And try repo root (backup existing)
-        try:
-            root_target = pathlib.Path(__file__).parent / csv_filename
+        # Also expose the file in playwright_captures/ (backward compatibility)
+        # and the repo root. These are hardlinks to the config/ copy, so the
+        # bytes are written once; the backup above already preserves the
+        # previous version. Falls back to a plain write (e.g. EXDEV or no
+        # config/ copy).
+        canonical = pathlib.Path(saved[0]) if saved else None
+        for target_dir in (PC_DIR, BASE_DIR):
             try:
-                if root_target.exists():
-                    bak3 = root_target.parent / f"{csv_filename}.bak.{int(time.time())}"
-                    root_target.replace(bak3)
+                target_dir.mkdir(exist_ok=True)
+                other = target_dir / csv_filename
+                tmp_other = target_dir / f".{csv_filename}.tmp"
+                _safe_unlink(tmp_other)
+                linked = False
+                if canonical is not None:
+                    try:
+                        os.link(canonical, tmp_other)
+                        linked = True
+                    except OSError:
+                        pass
+                if not linked:
+                    with open(tmp_other, 'wb') as out:
+                        out.write(content)
+                tmp_other.replace(other)
+                saved.append(str(other))
             except Exception:
                 pass
-            tmp3 = root_target.parent / f".{csv_filename}.tmp"
-            with open(tmp3, 'wb') as out:
-                out.write(content)
-            tmp3.replace(root_target)
-            saved.append(str(root_target))
-        except Exception:
-            pass
 
         if not saved:
             return jsonify({'success': False, 'message': 'Failed to save uploaded file'}), 500
@@ -3485,43 +4560,29 @@ def admin_upload_rooms_publisher():
         # the uploaded CSV becomes authoritative and no background runner is
         # concurrently writing files from the old state.
         try:
-            pc_dir = pathlib.Path(__file__).parent / 'playwright_captures'
-            pidfile = pc_dir / 'extract_detached.pid'
-            if pidfile.exists():
-                try:
-                    pid_text = pidfile.read_text(encoding='utf-8').strip()
-                    pid = int(pid_text)
-                except Exception:
-                    pid = None
-                if pid:
-                    try:
-                        # ask the process to terminate gracefully
-                        os.kill(pid, signal.SIGTERM)
-                        # wait a short while for it to exit
-                        for _ in range(10):
-                            time.sleep(0.5)
-                            try:
-                                os.kill(pid, 0)
-                            except OSError:
-                                break
-                        else:
-                            # still alive -> force kill
-                            try:
-                                os.kill(pid, signal.SIGKILL)
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
+            pid, alive = _check_detached_extractor(force=True)
+            if pid and alive:
                 try:
-                    pidfile.unlink()
+                    # ask the process to terminate gracefully
+                    os.kill(int(pid), signal.SIGTERM)
+                    # wait a short while for it to exit
+                    for _ in range(10):
+                        time.sleep(0.5)
+                        try:
+                            os.kill(int(pid), 0)
+                        except OSError:
+                            break
+                    else:
+                        # still alive -> force kill
+                        try:
+                            os.kill(int(pid), signal.SIGKILL)
+                        except Exception:
+                            pass
                 except Exception:
                     pass
+            _forget_detached_extractor()
             # clear in-memory extractor state hints
-            try:
-                extractor_state['running'] = False
-                extractor_state.pop('detached_pid', None)
-            except Exception:
-                pass
+            extractor_state['running'] = False
         except Exception:
             pass
 
@@ -3554,21 +4615,18 @@ def admin_upload_rooms_publisher():
         # Remove extracted per-calendar files and related artifacts so the
         # freshly uploaded CSV will be the sole source for the next extraction.
         try:
-            pc_dir = pathlib.Path(__file__).parent / 'playwright_captures'
-            # remove per-calendar event files
+            pc_dir = PC_DIR
+            # remove per-calendar event files (+ .count sidecars) and the
+            # generic events.json and mapping/misc files; unlinks are issued
+            # from a small pool since there can be hundreds of files.
+            targets = []
             for p in pc_dir.glob('events_*.json'):
-                try:
-                    p.unlink()
-                except Exception:
-                    pass
-            # remove the generic events.json and mapping/misc files
-            for name in ('events.json', 'calendar_map.json', 'subject_mappings.json', 'page_after_clicks.html', 'schedule_by_room.json'):
-                p = pc_dir / name
-                try:
-                    if p.exists():
-                        p.unlink()
-                except Exception:
-                    pass
+                targets.append(p)
+                targets.append(_events_count_path(p))
+            for name in ('events.json', 'events.ndjson', 'calendar_map.json', 'subject_mappings.json', 'page_after_clicks.html', 'schedule_by_room.json'):
+                targets.append(pc_dir / name)
+            with ThreadPoolExecutor(max_workers=_UNLINK_MAX_WORKERS) as ex:
+                list(ex.map(_safe_unlink, targets))
             # Write minimal placeholder files so frontends requesting these
             # resources during the import do not receive 500 errors.
             try:
@@ -3593,29 +4651,49 @@ def admin_upload_rooms_publisher():
         # then run the full extraction which will write per-calendar files.
         started_import = False
         try:
-            env = os.environ.copy()
-            env.setdefault('PYTHONUTF8', '1')
-            base = pathlib.Path(__file__).parent
+            env = _child_env()
+            base = BASE_DIR
 
             # populate DB synchronously so run_full_extraction sees the new rows
+            # (in-process: avoids a fresh interpreter start + imports). The
+            # tool modules are imported here, not at app start-up, so their
+            # import side effects only happen on an upload; if they cannot be
+            # imported the old subprocess invocation is used instead.
             try:
-                subprocess.run([sys.executable, str(base / 'tools' / 'populate_calendars_from_csv.py')], check=False, env=env, cwd=str(base))
+                from tools import populate_calendars_from_csv
             except Exception:
-                pass
+                populate_calendars_from_csv = None
+            try:
+                from tools import ics_repair_from_csv
+            except Exception:
+                ics_repair_from_csv = None
+            try:
+                if populate_calendars_from_csv is not None:
+                    populate_calendars_from_csv.main(DB_PATH, replace=True)
+                else:
+                    subprocess.run([sys.executable, str(base / 'tools' / 'populate_calendars_from_csv.py')], check=False, env=env, cwd=str(base))
+            except Exception:
+                app.logger.exception('populate_calendars_from_csv failed')
 
             # Run an ICS-first repair pass synchronously so .ics calendars
             # produce their per-calendar events_<sha8>.json immediately.
             try:
-                # Run the ICS-repair script in a small wrapper that ensures the
-                # project root is on sys.path. Executing via -c avoids issues
-                # where Python's sys.path[0] points to the tools/ directory and
-                # `import timetable` fails.
-                wrapper = (
-                    'import sys; '
-                    'sys.path.insert(0, "' + str(base) + '"); '
-                    'exec(open("tools/ics_repair_from_csv.py").read())'
-                )
-                subprocess.run([sys.executable, '-c', wrapper], check=False, env=env, cwd=str(base))
+                if ics_repair_from_csv is not None:
+                    try:
+                        ics_repair_from_csv.main(base)
+                    except Exception:
+                        app.logger.exception('ics_repair_from_csv failed')
+                else:
+                    # Run the ICS-repair script in a small wrapper that ensures the
+                    # project root is on sys.path. Executing via -c avoids issues
+                    # where Python's sys.path[0] points to the tools/ directory and
+                    # `import timetable` fails.
+                    wrapper = (
+                        'import sys; '
+                        'sys.path.insert(0, "' + str(base) + '"); '
+                        'exec(open("tools/ics_repair_from_csv.py").read())'
+                    )
+                    subprocess.run([sys.executable, '-c', wrapper], check=False, env=env, cwd=str(base))
                 # After ICS repair, build the merged schedule so the frontend
                 # can immediately show aggregated events (schedule_by_room.json)
                 # even before Playwright finishes HTML extraction.
@@ -3629,42 +4707,29 @@ def admin_upload_rooms_publisher():
             # Launch full extraction as a detached subprocess so it runs to
             # completion independently of the web worker process.
             try:
-                pc_dir = pathlib.Path(__file__).parent / 'playwright_captures'
+                pc_dir = PC_DIR
                 pc_dir.mkdir(exist_ok=True)
-                out_path = pc_dir / 'extract_stdout.txt'
-                err_path = pc_dir / 'extract_stderr.txt'
-                # open files in append mode so multiple runs don't clobber history
-                out_f = open(out_path, 'a', encoding='utf-8')
-                err_f = open(err_path, 'a', encoding='utf-8')
+                out_path = STDOUT_PATH
+                err_path = STDERR_PATH
                 # Prefer an explicit Python executable from the project venv if present
-                python_exec = os.environ.get('APP_PYTHON')
-                if not python_exec:
-                    # common venv locations in project root
-                    cand = [base / '.venv' / 'bin' / 'python3', base / '.venv' / 'bin' / 'python', base / 'env' / 'bin' / 'python3', base / 'env' / 'bin' / 'python']
-                    for c in cand:
-                        try:
-                            if c.exists():
-                                python_exec = str(c)
-                                break
-                        except Exception:
-                            continue
-                if not python_exec:
-                    python_exec = sys.executable
+                python_exec = _APP_PYTHON
 
                 # Use Popen so we don't block; start a new session so the child
                 # detaches from the web worker and continues independently.
-                proc = subprocess.Popen([python_exec, str(base / 'tools' / 'run_full_extraction.py')], stdout=out_f, stderr=err_f, env=env, cwd=str(base), start_new_session=True, close_fds=True)
+                # Logs are appended so multiple runs don't clobber history.
+                proc = _popen_detached([python_exec, str(base / 'tools' / 'run_full_extraction.py')], out_path, err_path, env=env, cwd=str(base))
                 # Record detached-run metadata so the admin UI can detect the
                 # background process and report that an import is in progress.
                 try:
                     extractor_state['running'] = True
-                    extractor_state['last_started'] = datetime.utcnow().isoformat()
+                    extractor_state['last_started'] = _iso_now(utc=True)
                     extractor_state['stdout_path'] = str(out_path)
                     extractor_state['stderr_path'] = str(err_path)
                     extractor_state['progress_message'] = f'Detached extraction started (pid {proc.pid})'
                     extractor_state['detached_pid'] = int(proc.pid)
+                    _track_detached_process(proc.pid)
                     # write a pid file for cross-process detection (persisted)
-                    pidfile = pc_dir / 'extract_detached.pid'
+                    pidfile = PIDFILE
                     try:
                         with open(pidfile, 'w', encoding='utf-8') as pf:
                             pf.write(str(proc.pid))
@@ -3744,10 +4809,9 @@ def admin_import_calendar():
     extractor_state['events_extracted'] = 0
     extractor_state['current_calendar'] = name or 'calendar'
 
-    # If a specific URL was provided, run per-URL extractor in a thread
+    # If a specific URL was provided, run per-URL extractor on the pool
     if url:
-        t = threading.Thread(target=_run_extractor_for_url, args=(url, name), daemon=True)
-        t.start()
+        _submit_url_extraction(url, name)
         return jsonify({'success': True, 'message': 'Import started', 'url': url}), 202
 
     # No url -> user asked to re-import ALL calendars. Launch the robust
@@ -3755,39 +4819,27 @@ def admin_import_calendar():
     # subprocess so it runs independently and writes the canonical
     # `import_progress.json` / `import_complete.txt` markers the UI consumes.
     try:
-        base = pathlib.Path(__file__).parent
-        pc_dir = base / 'playwright_captures'
+        base = BASE_DIR
+        pc_dir = PC_DIR
         pc_dir.mkdir(exist_ok=True)
-        out_path = pc_dir / 'extract_stdout.txt'
-        err_path = pc_dir / 'extract_stderr.txt'
-        # open files in append mode so multiple runs don't clobber history
-        out_f = open(out_path, 'a', encoding='utf-8')
-        err_f = open(err_path, 'a', encoding='utf-8')
+        out_path = STDOUT_PATH
+        err_path = STDERR_PATH
         # Prefer an explicit Python executable from the project venv if present
-        python_exec = os.environ.get('APP_PYTHON')
-        if not python_exec:
-            cand = [base / '.venv' / 'bin' / 'python3', base / '.venv' / 'bin' / 'python', base / 'env' / 'bin' / 'python3', base / 'env' / 'bin' / 'python']
-            for c in cand:
-                try:
-                    if c.exists():
-                        python_exec = str(c)
-                        break
-                except Exception:
-                    continue
-        if not python_exec:
-            python_exec = sys.executable
+        python_exec = _APP_PYTHON
 
-        proc = subprocess.Popen([python_exec, str(base / 'tools' / 'run_full_extraction.py')], stdout=out_f, stderr=err_f, env=os.environ.copy(), cwd=str(base), start_new_session=True, close_fds=True)
+        # logs are appended so multiple runs don't clobber history
+        proc = _popen_detached([python_exec, str(base / 'tools' / 'run_full_extraction.py')], out_path, err_path, cwd=str(base))
 
         # Record detached-run metadata for UI detection
         try:
             extractor_state['running'] = True
-            extractor_state['last_started'] = datetime.utcnow().isoformat()
+            extractor_state['last_started'] = _iso_now(utc=True)
             extractor_state['stdout_path'] = str(out_path)
             extractor_state['stderr_path'] = str(err_path)
             extractor_state['progress_message'] = f'Detached full extraction started (pid {proc.pid})'
             extractor_state['detached_pid'] = int(proc.pid)
-            pidfile = pc_dir / 'extract_detached.pid'
+            _track_detached_process(proc.pid)
+            pidfile = PIDFILE
             try:
                 with open(pidfile, 'w', encoding='utf-8') as pf:
                     pf.write(str(proc.pid))
@@ -3812,7 +4864,6 @@ def admin_import_calendar():
 @require_admin
 def admin_add_event():
     """Manually add an event."""
-    from dateutil import parser as dtparser
     
     title = request.form.get('title', '').strip()
     start_date = request.form.get('start_date', '')
@@ -3838,78 +4889,68 @@ def admin_add_event():
     
     # Store manual event in DB and also append to playwright_captures/events.json for compatibility
     try:
-        init_db()
         new_event = {
             'start': start_str,
             'end': end_str,
             'title': title,
             'location': location,
-            'raw': {'manual': True},
-            'created_at': datetime.now().isoformat()
+            'raw': {'manual': True, 'uid': uuid.uuid4().hex},
+            'created_at': _iso_now()
         }
         ev_id = add_manual_event_db(new_event)
-        # Append to playwright_captures/events.json as before
-        events_file = pathlib.Path('playwright_captures/events.json')
-        events = []
-        if events_file.exists():
-            try:
-                with open(events_file, 'r', encoding='utf-8') as f:
-                    events = json.load(f)
-            except Exception:
-                events = []
-        events.append(new_event)
-        events_file.parent.mkdir(exist_ok=True)
-        with open(events_file, 'w', encoding='utf-8') as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        # Mirror into playwright_captures/events.json (via the append-only log)
+        _append_manual_event_log(new_event)
         return jsonify({'success': True, 'message': 'Event added successfully', 'id': ev_id})
     except Exception:
         # fallback to previous file-only behavior
-        events_file = pathlib.Path('playwright_captures/events.json')
-        events = []
-        if events_file.exists():
-            try:
-                with open(events_file, 'r', encoding='utf-8') as f:
-                    events = json.load(f)
-            except Exception:
-                events = []
         new_event = {
             'start': start_str,
             'end': end_str,
             'title': title,
             'location': location,
-            'raw': {'manual': True}
+            'raw': {'manual': True, 'uid': uuid.uuid4().hex}
         }
-        events.append(new_event)
-        events_file.parent.mkdir(exist_ok=True)
-        with open(events_file, 'w', encoding='utf-8') as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
+        _append_manual_event_log(new_event)
         return jsonify({'success': True, 'message': 'Event added successfully'})
 
 
 @app.route('/admin/delete_event', methods=['POST'])
 @require_admin
 def admin_delete_event():
-    """Delete an event by index."""
+    """Delete a manual event by DB ``id`` (or, legacy, by events.json ``index``)."""
+    if request.form.get('id') is not None:
+        try:
+            man_id = int(request.form['id'])
+        except ValueError:
+            return jsonify({'success': False, 'message': 'Invalid event id'}), 400
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT start, title, location, raw FROM manual_events WHERE id = ?', (man_id,))
+            row = cur.fetchone()
+            if not row:
+                return jsonify({'success': False, 'message': 'Event not found'}), 404
+            cur.execute('DELETE FROM manual_events WHERE id = ?', (man_id,))
+            conn.commit()
+        gone = dict(row)
+        try:
+            uid = json.loads(gone.pop('raw') or '{}').get('uid')
+        except (ValueError, AttributeError):
+            uid = None
+        # events added before uids existed fall back to a field match
+        _append_manual_event_log({'_deleted': {'uid': uid} if uid else gone})
+        return jsonify({'success': True, 'message': 'Event deleted'})
+
     try:
         index = int(request.form.get('index', -1))
     except ValueError:
         return jsonify({'success': False, 'message': 'Invalid index'}), 400
     
-    events_file = pathlib.Path('playwright_captures/events.json')
-    if not events_file.exists():
+    removed = _pop_events_json_index(index)
+    if removed is None:
         return jsonify({'success': False, 'message': 'No events file'}), 404
-    
-    with open(events_file, 'r', encoding='utf-8') as f:
-        events = json.load(f)
-    
-    if index < 0 or index >= len(events):
+    if not removed:
         return jsonify({'success': False, 'message': 'Index out of range'}), 400
     
-    events.pop(index)
-    
-    with open(events_file, 'w', encoding='utf-8') as f:
-        json.dump(events, f, indent=2, ensure_ascii=False)
-    
     return jsonify({'success': True, 'message': 'Event deleted'})
 
 
@@ -3923,7 +4964,6 @@ def admin_delete_calendar():
         return jsonify({'success': False, 'message': 'Invalid calendar id'}), 400
 
     try:
-        init_db()
         
         # 1. Get URL to identify files to delete
         url = None
@@ -3937,39 +4977,33 @@ def admin_delete_calendar():
         if url:
             # 2. Delete associated files
             try:
-                h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+                h = _url_hash(url)
                 out_dir = pathlib.Path('playwright_captures')
                 
-                # Delete events file
-                events_file = out_dir / f'events_{h}.json'
-                if events_file.exists():
-                    events_file.unlink()
-                
-                # Delete log files
-                (out_dir / f'extract_{h}.stdout.txt').unlink(missing_ok=True)
-                (out_dir / f'extract_{h}.stderr.txt').unlink(missing_ok=True)
+                # Delete the events file, its .count sidecar and the
+                # extractor logs in one directory pass
+                prefixes = (f'events_{h}.', f'extract_{h}.')
+                try:
+                    with os.scandir(out_dir) as it:
+                        stale = [e.path for e in it if e.name.startswith(prefixes)]
+                except FileNotFoundError:
+                    stale = []
+                for p in stale:
+                    _safe_unlink(p)
                 
                 # 3. Update calendar_map.json
-                map_path = out_dir / 'calendar_map.json'
-                if map_path.exists():
-                    try:
-                        with open(map_path, 'r', encoding='utf-8') as f:
-                            cmap = json.load(f)
-                        if h in cmap:
-                            del cmap[h]
-                            with open(map_path, 'w', encoding='utf-8') as f:
-                                json.dump(cmap, f, indent=2)
-                    except Exception:
-                        pass
+                try:
+                    _mutate_calendar_map(lambda cmap: cmap.pop(h, None) is not None)
+                except Exception:
+                    pass
             except Exception as e:
                 print(f"Error cleaning up files for calendar {cal_id}: {e}")
 
         # 4. Delete from DB
         delete_calendar_db(cal_id)
         
-        # 5. Regenerate merged events and schedule
-        today = date.today()
-        ensure_schedule(today, today + timedelta(days=7))
+        # 5. Regenerate merged events and schedule (in the background)
+        _request_schedule_regen()
         
         return jsonify({'success': True, 'message': 'Calendar deleted and events removed'})
     except Exception as e:
@@ -3990,39 +5024,43 @@ def admin_update_calendar_color():
         return jsonify({'success': False, 'message': 'Color is required'}), 400
 
     try:
-        init_db()
         with get_db_connection() as conn:
             cur = conn.cursor()
             # Get the URL for this calendar
-            cur.execute('SELECT url FROM calendars WHERE id = ?', (cal_id,))
+            cur.execute('SELECT url, color FROM calendars WHERE id = ?', (cal_id,))
             row = cur.fetchone()
             if not row:
                 return jsonify({'success': False, 'message': 'Calendar not found'}), 404
             url = row['url']
-            # Update the color
-            cur.execute('UPDATE calendars SET color = ? WHERE id = ?', (color, cal_id))
-            conn.commit()
+            # Update the color (color pickers re-post the same value often)
+            if row['color'] != color:
+                cur.execute('UPDATE calendars SET color = ? WHERE id = ?', (color, cal_id))
+                conn.commit()
         
-        # Also update calendar_map.json
-        import hashlib
-        h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
-        map_path = pathlib.Path('playwright_captures') / 'calendar_map.json'
-        if map_path.exists():
-            try:
-                with open(map_path, 'r', encoding='utf-8') as f:
-                    cmap = json.load(f)
-                if h in cmap:
-                    cmap[h]['color'] = color
-                    with open(map_path, 'w', encoding='utf-8') as f:
-                        json.dump(cmap, f, indent=2, ensure_ascii=False)
-            except Exception:
-                pass
+        # Also update calendar_map.json, only if it actually differs
+        h = _url_hash(url)
+
+        def _set_color(cmap: dict) -> bool:
+            entry = cmap.get(h)
+            if entry is None or entry.get('color') == color:
+                return False
+            entry['color'] = color
+            return True
+
+        try:
+            _mutate_calendar_map(_set_color)
+        except Exception:
+            pass
         
         return jsonify({'success': True, 'message': 'Color updated'})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Failed to update color: {e}'}), 500
 
 
+# UPN (mailbox address) embedded in a published calendar URL
+_UPN_RE = re.compile(r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+
+
 @app.route('/admin/update_calendar', methods=['POST'])
 @require_admin
 def admin_update_calendar():
@@ -4039,7 +5077,6 @@ def admin_update_calendar():
         return jsonify({'success': False, 'message': 'Invalid parameters'}), 400
 
     try:
-        init_db()
         with get_db_connection() as conn:
             cur = conn.cursor()
             # Get the URL for this calendar
@@ -4052,8 +5089,7 @@ def admin_update_calendar():
             # If a new URL was provided and is different, update url and try to extract upn
             if new_url and new_url != url:
                 # extract upn-like substring from URL if present
-                import re
-                m = re.search(r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})', new_url)
+                m = _UPN_RE.search(new_url)
                 upn_val = m.group(1) if m else None
                 cur.execute('UPDATE calendars SET url = ?, upn = ? WHERE id = ?', (new_url, upn_val, cal_id))
                 url = new_url
@@ -4063,41 +5099,30 @@ def admin_update_calendar():
                        (name, color or None, 1 if enabled_bool else 0, cal_id))
             conn.commit()
         
-        # Also update calendar_map.json
-        h = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
-        map_path = pathlib.Path('playwright_captures') / 'calendar_map.json'
-        if map_path.exists():
-            try:
-                with open(map_path, 'r', encoding='utf-8') as f:
-                    cmap = json.load(f)
-                if h in cmap:
-                    cmap[h]['name'] = name
-                    cmap[h]['color'] = color
-                    with open(map_path, 'w', encoding='utf-8') as f:
-                        json.dump(cmap, f, indent=2, ensure_ascii=False)
-            except Exception:
-                pass
+        # Also update calendar_map.json (the schedule build reads the color
+        # from here, so make sure extracted calendars have an entry)
+        h = _url_hash(url)
+        extracted = (pathlib.Path('playwright_captures') / f'events_{h}.json').exists()
+
+        def _set_name_color(cmap: dict) -> bool:
+            entry = cmap.get(h)
+            if entry is None and extracted:
+                entry = cmap[h] = {'url': url}
+            if entry is None or (entry.get('name'), entry.get('color')) == (name, color):
+                return False
+            entry['name'] = name
+            entry['color'] = color
+            return True
+
+        try:
+            _mutate_calendar_map(_set_name_color, create=extracted)
+        except Exception:
+            pass
         
-        # Update events in events_{h}.json with new color
+        # events_{h}.json is not touched: the schedule build applies the
+        # calendar color from calendar_map.json. Regenerate in the background.
         if color:
-            events_file = pathlib.Path('playwright_captures') / f'events_{h}.json'
-            if events_file.exists():
-                try:
-                    with open(events_file, 'r', encoding='utf-8') as f:
-                        events = json.load(f)
-                    for ev in events:
-                        ev['color'] = color
-                    with open(events_file, 'w', encoding='utf-8') as f:
-                        json.dump(events, f, indent=2, ensure_ascii=False, default=str)
-                except Exception:
-                    pass
-            
-            # Regenerate merged events.json
-            try:
-                today = date.today()
-                ensure_schedule(today, today + timedelta(days=7))
-            except Exception:
-                pass
+            _request_schedule_regen()
         
         return jsonify({'success': True, 'message': 'Calendar updated'})
     except Exception as e:
@@ -4114,7 +5139,6 @@ def admin_delete_manual():
         return jsonify({'success': False, 'message': 'Invalid event id'}), 400
 
     try:
-        init_db()
         delete_manual_db(man_id)
         return jsonify({'success': True, 'message': 'Manual event deleted'})
     except Exception as e:
@@ -4130,7 +5154,6 @@ def extracurricular_events_view():
     """View extracurricular events."""
     # Read events from DB
     try:
-        init_db()
         events = list_extracurricular_db()
     except Exception:
         # fallback to file
@@ -4143,34 +5166,32 @@ def extracurricular_events_view():
             except Exception:
                 events = []
     
-    # Sort by date
-    from dateutil import parser as dtparser
+    # One pass: sort key (many events share a date; parse each distinct one
+    # once), category set for filtering, and cleaned/display titles (apply
+    # subject parsing rules; parse_title_cached memoizes repeated titles)
+    date_cache = {}
+    categories = set()
     for ev in events:
-        try:
-            ev['_date'] = dtparser.parse(ev.get('date', ''))
-        except:
-            ev['_date'] = datetime.max
-    events.sort(key=lambda x: x['_date'])
-    
-    # Get unique categories for filtering
-    categories = sorted(set(ev.get('category', 'Other') for ev in events))
-    
-    # Parse titles so UI shows cleaned/display titles (apply subject parsing rules)
-    try:
-        from tools.event_parser import parse_title
-        for ev in events:
+        raw_date = ev.get('date', '')
+        parsed = date_cache.get(raw_date)
+        if parsed is None:
             try:
-                parsed = parse_title(ev.get('title', '') or '')
-                ev['display_title'] = parsed.display_title
-                ev['subject'] = parsed.subject
-            except Exception:
-                ev['display_title'] = ev.get('title')
-                ev['subject'] = ev.get('subject', '')
-    except Exception:
-        # If parser not available, fallback to raw title
-        for ev in events:
+                parsed = _parse_datetime(raw_date)
+            except:
+                parsed = datetime.max
+            date_cache[raw_date] = parsed
+        ev['_date'] = parsed
+        categories.add(ev.get('category', 'Other'))
+        try:
+            parsed_title = parse_title_cached(ev.get('title', '') or '')
+            ev['display_title'] = parsed_title.display_title
+            ev['subject'] = parsed_title.subject
+        except Exception:
+            # parser not available (or failed): fall back to the raw title
             ev['display_title'] = ev.get('title')
             ev['subject'] = ev.get('subject', '')
+    events.sort(key=lambda x: x['_date'])
+    categories = sorted(categories)
 
     return render_template('extracurricular.html', events=events, categories=categories)
 
@@ -4191,7 +5212,6 @@ def add_extracurricular_event():
     
     # Store in DB
     try:
-        init_db()
         new_event = {
             'title': title,
             'organizer': organizer,
@@ -4200,7 +5220,7 @@ def add_extracurricular_event():
             'location': location,
             'category': category or 'Other',
             'description': description,
-            'created_at': datetime.now().isoformat()
+            'created_at': _iso_now()
         }
         ev_id = add_extracurricular_db(new_event)
         return jsonify({'success': True, 'message': 'Event added successfully', 'id': ev_id})
@@ -4224,7 +5244,7 @@ def add_extracurricular_event():
             'location': location,
             'category': category or 'Other',
             'description': description,
-            'created_at': datetime.now().isoformat()
+            'created_at': _iso_now()
         }
         events.append(new_event)
         with open(events_file, 'w', encoding='utf-8') as f:
@@ -4242,7 +5262,6 @@ def delete_extracurricular_event():
     
     # Try DB deletion first
     try:
-        init_db()
         delete_extracurricular_db(event_id)
         return jsonify({'success': True, 'message': 'Event deleted'})
     except Exception:
@@ -4262,15 +5281,45 @@ def delete_extracurricular_event():
 # React SPA frontend routes
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Hash-agnostic fallbacks for frontend/dist/assets: extension -> first
+# index-*.<ext> file. The directory only changes on redeploy, so the scan is
+# redone only when its mtime moves.
+_ASSET_FALLBACK_CACHE: dict = {}
+_ASSET_CACHE_MTIME: Optional[float] = None
+
+
+def _asset_fallback(assets_dir: pathlib.Path, ext: str) -> Optional[pathlib.Path]:
+    """Return a current index-*<ext> bundle from assets_dir, or None."""
+    global _ASSET_FALLBACK_CACHE, _ASSET_CACHE_MTIME
+    try:
+        mtime = os.stat(assets_dir).st_mtime
+    except OSError:
+        return None
+    if mtime != _ASSET_CACHE_MTIME:
+        found = {}
+        with os.scandir(assets_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.startswith('index-'):
+                    continue
+                for e in ('.css', '.js'):
+                    if name.endswith(e) and e not in found:
+                        found[e] = pathlib.Path(entry.path)
+        _ASSET_FALLBACK_CACHE = found
+        _ASSET_CACHE_MTIME = mtime
+    return _ASSET_FALLBACK_CACHE.get(ext)
+
+
 @app.route('/frontend/<path:filename>')
 def frontend_static(filename):
     """Serve built frontend assets from frontend/dist."""
-    frontend_dist = pathlib.Path(__file__).parent / 'frontend' / 'dist'
-    target = frontend_dist / filename
+    frontend_dist = FRONTEND_DIST
     try:
-        if target.exists():
-            return send_file(target)
-    except Exception:
+        # Hashed bundles under assets/ never change content, so browsers may
+        # cache them for a year; conditional requests get 304s.
+        max_age = 31536000 if filename.startswith('assets/') else 0
+        return send_from_directory(frontend_dist, filename, max_age=max_age, conditional=True)
+    except (NotFound, OSError):
         # fall through to fallback behaviour
         pass
 
@@ -4280,72 +5329,122 @@ def frontend_static(filename):
     #    frontend/dist/assets with a current hash (e.g., index-*.css).
     # 2. Otherwise, return the built index.html so the SPA can bootstrap.
     try:
-        assets_dir = frontend_dist / 'assets'
         name = pathlib.Path(filename).name
-        if assets_dir.exists() and name.endswith('.css'):
-            # try to find any index-*.css
-            for p in assets_dir.glob('index-*.css'):
-                return send_file(p)
-        if assets_dir.exists() and name.endswith('.js'):
-            for p in assets_dir.glob('index-*.js'):
+        ext = '.css' if name.endswith('.css') else '.js' if name.endswith('.js') else None
+        if ext:
+            p = _asset_fallback(frontend_dist / 'assets', ext)
+            if p is not None:
                 return send_file(p)
     except Exception:
         pass
 
     # Last-resort: serve the SPA index.html so the browser gets a valid page
     try:
-        idx = frontend_dist / 'index.html'
-        if idx.exists():
-            return send_file(idx)
-    except Exception:
+        return send_file(FRONTEND_INDEX)
+    except OSError:
         pass
 
     return "Not found", 404
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_event_fields_cached(title: str, location: str, raw_subject: str,
+                               raw_location: str, src_name: str) -> tuple:
+    parsed = parse_event({
+        'title': title,
+        'location': location,
+        'raw': {'Subject': raw_subject, 'Location': {'DisplayName': raw_location}},
+        'source': src_name,
+    })
+    return (parsed.get('room'), parsed.get('building'), parsed.get('professor'),
+            parsed.get('subject'), parsed.get('display_title'))
+
+
+def _parse_event_fields(ev: dict) -> tuple:
+    """(room, building, professor, subject, display_title) from parse_event(ev).
+
+    Memoized on exactly the inputs parse_event reads; the same lessons repeat
+    across rooms, days and sources.
+    """
+    raw = ev.get('raw') or {}
+    raw_subject = raw_location = ''
+    if isinstance(raw, dict):
+        raw_subject = raw.get('Subject', '') or ''
+        raw_loc = raw.get('Location', {})
+        if isinstance(raw_loc, dict):
+            raw_location = raw_loc.get('DisplayName', '') or ''
+    src = ev.get('source')
+    if not isinstance(src, str):
+        src = ev.get('calendar_name')
+        src = src if isinstance(src, str) else ''
+    return _parse_event_fields_cached(ev.get('title', '') or '', ev.get('location', '') or '',
+                                      str(raw_subject), str(raw_location), src)
+
+
+# Fields whose presence makes a duplicate departure entry "richer"
+_SCORE_KEYS = ('room', 'professor', 'calendar_name', 'subject')
+
+
+def _event_score(ev: dict) -> int:
+    """Number of populated _SCORE_KEYS fields (dedupe keeps the highest)."""
+    return sum(1 for k in _SCORE_KEYS if ev.get(k))
+
+
+# Location patterns used by departures_json (dedupe keys, building codes)
+_SALA_RE = re.compile(r'sala\s*([A-Za-z0-9\-]+)', re.IGNORECASE)
+_ROOM_RE = re.compile(r'room\s*([A-Za-z0-9\-]+)', re.IGNORECASE)
+_NUM_TOKEN_RE = re.compile(r'(\d+[A-Za-z\-]?)')
+_BLDG_PREFIX_RE = re.compile(r'^([A-Z]{1,3})')
+
+
+@functools.lru_cache(maxsize=512)
+def _room_to_bldg(room: str):
+    """Fallback building code from a room token (e.g. BT503 -> BT), or None."""
+    m = _BLDG_PREFIX_RE.match(room.upper())
+    return m.group(1) if m else None
+
+
 @app.route('/departures.json')
 def departures_json():
     """Return events for today and tomorrow as JSON for the departures board."""
-    from dateutil import parser as dtparser
-    
     today = date.today()
     tomorrow = today + timedelta(days=1)
+    wanted_days = (today.isoformat(), tomorrow.isoformat())
     
     # Load events from schedule (use cached reads)
     events_file = pathlib.Path('playwright_captures/events.json')
-    all_events = []
-    
-    loaded = _read_json_cached(str(events_file))
-    if loaded and isinstance(loaded, list):
-        # mark origin for debugging
-        for it in loaded:
-            if isinstance(it, dict):
-                it.setdefault('_origin', 'events_json')
-        all_events = list(loaded)  # copy so we don't mutate cache
+    # copy so we don't mutate the cached list
+    all_events = list(_read_events_json_cached(str(events_file)))
+    pending = _read_pending_event_log(events_file)
+    if pending:
+        # manual events the writer has not folded in yet
+        for ev in pending:
+            if isinstance(ev, dict):
+                ev.setdefault('_origin', 'events_json')
+        all_events = _apply_event_log(all_events, pending)
     
     # Also load from schedule_by_room.json if available (cached)
     schedule_file = pathlib.Path('playwright_captures/schedule_by_room.json')
-    schedule = _read_json_cached(str(schedule_file))
-    if schedule and isinstance(schedule, dict):
-        for room, days in schedule.items():
-            for day, evs in days.items():
-                for e in evs:
-                    ec = dict(e)  # copy so we don't mutate cache
-                    ec['room'] = room
-                    if isinstance(ec, dict):
-                        ec.setdefault('_origin', 'schedule_by_room')
-                    all_events.append(ec)
+    by_day = _read_schedule_by_day_cached(str(schedule_file))
+    # day buckets are keyed by the events' start date, so only today's and
+    # tomorrow's can survive the filter below; merge them back in file order
+    for _, e in heapq.merge(*(by_day.get(d, ()) for d in wanted_days), key=itemgetter(0)):
+        # one copy (enrichment below mutates it; the cache must not change)
+        all_events.append(dict(e))
     
     # Add extracurricular events from DB
     try:
-        init_db()
         extra_events = list_extracurricular_db()
         for xe in extra_events:
             d = xe.get('date')
             if not d:
                 continue
             t = (xe.get('time') or '').strip()
-            start = f"{d}T{t}:00" if t else d
+            start = d + 'T' + t + ':00' if t else d
+            # same ISO date-prefix test as the filter below, applied before
+            # building the event dict for rows outside today/tomorrow
+            if start[4:5] == '-' and start[7:8] == '-' and start[:10] not in wanted_days:
+                continue
             evt = {
                 'title': xe.get('title'),
                 'start': start,
@@ -4378,38 +5477,17 @@ def departures_json():
     except Exception:
         pass
     
-    # Filter for today and tomorrow
-    filtered = []
-    for ev in all_events:
-        start_str = ev.get('start')
-        if not start_str:
-            continue
-        try:
-            start_dt = dtparser.parse(start_str)
-            event_date = start_dt.date()
-            if event_date in (today, tomorrow):
-                filtered.append(ev)
-        except Exception:
-            continue
-
     # Deduplicate events: events.json may contain the same items as schedule_by_room.json
     # Use raw.ItemId.Id when available, otherwise fallback to title|start|location key.
     # Improved deduplication: prefer events with more populated fields when duplicates
-    deduped = []
-    seen_map = {}  # map key_start_loc -> index in deduped
-    # Prepare duplicates debug file
-    try:
-        debug_out_dir = pathlib.Path('playwright_captures')
-        debug_out_dir.mkdir(parents=True, exist_ok=True)
-        dup_log_path = debug_out_dir / 'duplicates_debug.jsonl'
-    except Exception:
-        dup_log_path = None
+    deduped = {}   # dedupe key -> kept event (dicts keep insertion order)
+    scores = {}    # dedupe key -> _event_score of the kept event, set on first collision
+    # Duplicate records are buffered here and appended to
+    # duplicates_debug.jsonl in one write once the dedupe pass is done
+    dup_lines = []
 
     def _log_duplicate(existing, incoming, key, reason=''):
         try:
-            if not dup_log_path:
-                return
-            import time, json
             rec = {
                 'ts': datetime.utcnow().isoformat(),
                 'key': key,
@@ -4427,11 +5505,9 @@ def departures_json():
                     'origin': incoming.get('_origin') if isinstance(incoming, dict) else None,
                 }
             }
-            with open(dup_log_path, 'a', encoding='utf-8') as df:
-                df.write(json.dumps(rec, ensure_ascii=False) + '\n')
+            dup_lines.append(json.dumps(rec, ensure_ascii=False) + '\n')
         except Exception:
             pass
-    import re
 
     def _normalize_location_for_key(ev: dict) -> str:
         """Return a compact location token suitable for dedupe keys.
@@ -4448,105 +5524,109 @@ def departures_json():
         if not loc:
             return ''
         # try common patterns
-        m = re.search(r'sala\s*([A-Za-z0-9\-]+)', loc, flags=re.IGNORECASE)
+        m = _SALA_RE.search(loc)
         if m:
             return m.group(1)
-        m = re.search(r'room\s*([A-Za-z0-9\-]+)', loc, flags=re.IGNORECASE)
+        m = _ROOM_RE.search(loc)
         if m:
             return m.group(1)
         # last numeric token
-        nums = re.findall(r'(\d+[A-Za-z\-]?)', loc)
+        nums = _NUM_TOKEN_RE.findall(loc)
         if nums:
             return nums[-1]
         # fallback: use trimmed, lowercased location (shortened)
         return loc.lower()
-    for ev in filtered:
+
+    # Single pass: keep today's and tomorrow's events, deduping as we go.
+    # ISO starts ('YYYY-MM-DD...') are matched on their date prefix (the
+    # wall-clock date, as .date() of the parsed value would give); anything
+    # else is parsed, once per distinct string.
+    date_cache = {}
+    for ev in all_events:
+        start_str = ev.get('start')
+        if not start_str:
+            continue
+        if isinstance(start_str, str) and start_str[4:5] == '-' and start_str[7:8] == '-':
+            if start_str[:10] not in wanted_days:
+                continue
+        else:
+            try:
+                event_date = date_cache.get(start_str)
+                if event_date is None:
+                    event_date = date_cache[start_str] = _parse_datetime(start_str).date()
+            except Exception:
+                continue
+            if event_date not in (today, tomorrow):
+                continue
+
         try:
-            raw = ev.get('raw') or {}
+            iid = ev['raw']['ItemId']['Id']
+        except (KeyError, TypeError):
             iid = None
-            if isinstance(raw, dict):
-                try:
-                    iid = raw.get('ItemId', {}).get('Id') if raw.get('ItemId') else None
-                except Exception:
-                    iid = None
-
-            # If ItemId available, use a dedicated key
-            if iid:
-                pkey = f'ID:{iid}'
-                if pkey in seen_map:
-                    # compare scores and replace if new event is richer
-                    idx = seen_map[pkey]
-                    existing = deduped[idx]
-                    def score(x):
-                        return int(bool(x.get('room'))) + int(bool(x.get('professor'))) + int(bool(x.get('calendar_name'))) + int(bool(x.get('subject')))
-                    if score(ev) > score(existing):
-                        _log_duplicate(existing, ev, pkey, reason='iid_better_score')
-                        deduped[idx] = ev
-                else:
-                    seen_map[pkey] = len(deduped)
-                    deduped.append(ev)
-                continue
 
-            start = str(ev.get('start') or '').strip()
+        # If ItemId available, use a dedicated key
+        if iid:
+            key = f'ID:{iid}'
+            reason = 'iid_better_score'
+        else:
+            start = str(start_str).strip()
             loc = _normalize_location_for_key(ev)
-            norm_title = str(ev.get('title') or '').strip().lower()
-            key_start_loc = f'SL:{start}|{loc}'
-
-            if key_start_loc in seen_map:
-                idx = seen_map[key_start_loc]
-                existing = deduped[idx]
-                def score(x):
-                    return int(bool(x.get('room'))) + int(bool(x.get('professor'))) + int(bool(x.get('calendar_name'))) + int(bool(x.get('subject')))
-                if score(ev) > score(existing):
-                    _log_duplicate(existing, ev, key_start_loc, reason='sl_better_score')
-                    deduped[idx] = ev
-                # else keep existing
-            else:
-                seen_map[key_start_loc] = len(deduped)
-                deduped.append(ev)
+            key = f'SL:{start}|{loc}'
+            reason = 'sl_better_score'
+
+        existing = deduped.get(key)
+        if existing is None:
+            deduped[key] = ev
+            continue
+        # compare scores and replace if new event is richer (else keep existing);
+        # replacing keeps the key's original position
+        existing_score = scores.get(key)
+        if existing_score is None:
+            existing_score = scores[key] = _event_score(existing)
+        incoming_score = _event_score(ev)
+        if incoming_score > existing_score:
+            _log_duplicate(existing, ev, key, reason=reason)
+            deduped[key] = ev
+            scores[key] = incoming_score
+    filtered = list(deduped.values())
+
+    if dup_lines:
+        try:
+            debug_out_dir = pathlib.Path('playwright_captures')
+            debug_out_dir.mkdir(parents=True, exist_ok=True)
+            with open(debug_out_dir / 'duplicates_debug.jsonl', 'a', encoding='utf-8') as df:
+                df.write(''.join(dup_lines))
         except Exception:
-            deduped.append(ev)
-    filtered = deduped
+            pass
     
     # ensure buildings var exists even if enrichment fails
     buildings = {}
 
     # Enrich events with calendar_name and parsed group/year when possible
     try:
-        map_path = pathlib.Path('playwright_captures') / 'calendar_map.json'
-        cmap = {}
-        if map_path.exists():
-            try:
-                with open(map_path, 'r', encoding='utf-8') as mf:
-                    cmap = json.load(mf)
-            except Exception:
-                cmap = {}
-        # load parser utilities (for group/year, and richer location/title parsing)
-        try:
-            from tools.event_parser import parse_group_from_string, parse_event
-        except Exception:
-            parse_group_from_string = None
-            parse_event = None
+        cmap = _read_json_cached(str(pathlib.Path('playwright_captures') / 'calendar_map.json')) or {}
+        # source hash -> calendar name, resolved once per request instead of
+        # three map lookups per event (room/subject/group parsing is memoized
+        # per distinct input by the *_cached helpers)
+        cal_names = {h: v['name'] for h, v in cmap.items() if isinstance(v, dict) and v.get('name')}
 
         for ev in filtered:
             try:
                 src = ev.get('source')
-                if src and cmap.get(src) and cmap.get(src).get('name'):
-                    ev['calendar_name'] = cmap.get(src).get('name')
-                else:
-                    ev['calendar_name'] = ev.get('calendar_name') if ev.get('calendar_name') is not None else None
+                name = cal_names.get(src) if src else None
+                ev['calendar_name'] = name if name else ev.get('calendar_name')
 
                 # Enrich event using backend parser when available. This ensures we have
                 # structured 'room' and 'building' values instead of free-form location strings.
                 if parse_event:
                     try:
-                        parsed = parse_event(ev)
+                        p_room, p_building, p_professor, p_subject, p_display = _parse_event_fields(ev)
                         # prefer parsed structured values (room/building) when available
-                        ev['room'] = (parsed.get('room') or ev.get('room') or '')
-                        ev['building'] = (parsed.get('building') or ev.get('building') or '')
-                        ev['professor'] = (parsed.get('professor') or ev.get('professor') or None)
-                        ev['subject'] = (parsed.get('subject') or ev.get('subject') or ev.get('title'))
-                        ev['display_title'] = (parsed.get('display_title') or ev.get('display_title') or ev.get('title'))
+                        ev['room'] = (p_room or ev.get('room') or '')
+                        ev['building'] = (p_building or ev.get('building') or '')
+                        ev['professor'] = (p_professor or ev.get('professor') or None)
+                        ev['subject'] = (p_subject or ev.get('subject') or ev.get('title'))
+                        ev['display_title'] = (p_display or ev.get('display_title') or ev.get('title'))
                     except Exception:
                         # ignore parsing failure per-event
                         ev['room'] = ev.get('room') or ''
@@ -4557,10 +5637,10 @@ def departures_json():
 
                 # parse group/year
                 sample = ev.get('calendar_name') or ev.get('subject') or ev.get('title') or ''
-                if parse_group_from_string:
+                if parse_group_cached:
                     try:
-                        grp = parse_group_from_string(sample)
-                        if grp and isinstance(grp, dict):
+                        grp = parse_group_cached(sample)
+                        if grp:
                             ev['year'] = grp.get('year', '')
                             ev['group'] = grp.get('group', '')
                             ev['group_display'] = grp.get('display', '')
@@ -4599,19 +5679,15 @@ def departures_json():
         else:
             # fallback: try to extract building code from room (e.g. BT503 -> BT)
             room = (ev.get('room') or '').strip()
-            if room:
-                import re
-                m = re.match(r'^([A-Z]{1,3})', room.upper())
-                if m:
-                    code = m.group(1)
-                    if code not in buildings:
-                        buildings[code] = code
+            code = _room_to_bldg(room) if room else None
+            if code and code not in buildings:
+                buildings[code] = code
     
-    return jsonify({
+    return _json_response({
         'events': filtered,
         'buildings': buildings,
-        'today': today.isoformat(),
-        'tomorrow': tomorrow.isoformat()
+        'today': wanted_days[0],
+        'tomorrow': wanted_days[1],
     })
 
 
@@ -0,0 +1,95 @@
+import unittest
+import tempfile
+import os
+import pickle
+from pathlib import Path
+
+from tools import apply_exact_csv_matches, apply_token_match
+
+
+OWNER = 'utcn_room_ac_bar_bt-503@campus.utcluj.ro'
+
+
+def _token_url(h):
+    return f'https://outlook.office365.com/owa/calendar/{OWNER}/{h}/calendar.html'
+
+
+class CsvSidecarCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.csv = self.root / 'rooms.csv'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_token_csv(self, email, h):
+        self.csv.write_text(f'Sala,{email},x,y,{_token_url(h)},\n', encoding='utf-8')
+        # make the rewrite visible even on coarse mtime filesystems
+        st = self.csv.stat()
+        os.utime(self.csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    def _token_sidecar(self):
+        return self.root / '.rooms.csv.token_idx.pkl'
+
+    def _leftovers(self):
+        return sorted(p.name for p in self.root.iterdir() if p.name.endswith('.tmp') or '.pkl.' in p.name)
+
+    def test_token_index_sidecar_replaced_after_csv_rewrite(self):
+        self._write_token_csv('old@campus.utcluj.ro', 'aaaaaaaa1111')
+        index, _, _ = apply_token_match.build_csv_index(str(self.csv))
+        self.assertEqual(index, {(OWNER, 'aaaaaaaa'): 'old@campus.utcluj.ro'})
+        self.assertTrue(self._token_sidecar().exists())
+
+        self._write_token_csv('new@campus.utcluj.ro', 'bbbbbbbb2222')
+        index, _, _ = apply_token_match.build_csv_index(str(self.csv))
+        self.assertEqual(index, {(OWNER, 'bbbbbbbb'): 'new@campus.utcluj.ro'})
+        with open(self._token_sidecar(), 'rb') as f:
+            sig, (cached_index, _, _) = pickle.load(f)
+        self.assertEqual(sig[1], self.csv.stat().st_mtime_ns)
+        self.assertEqual(cached_index, index)
+        self.assertEqual(self._leftovers(), [])
+
+    def test_token_index_corrupt_sidecar_falls_back_to_parsing(self):
+        self._write_token_csv('a@campus.utcluj.ro', 'cccccccc3333')
+        self._token_sidecar().write_bytes(b'not a pickle')
+        index, ambiguous, rows = apply_token_match.build_csv_index(str(self.csv))
+        self.assertEqual(index, {(OWNER, 'cccccccc'): 'a@campus.utcluj.ro'})
+        self.assertEqual((ambiguous, rows), (set(), 1))
+        # the corrupt file was replaced by a readable one
+        with open(self._token_sidecar(), 'rb') as f:
+            self.assertEqual(pickle.load(f)[1][0], index)
+
+    def _load_exact(self):
+        saved = apply_exact_csv_matches.CSV_PATHS
+        apply_exact_csv_matches.CSV_PATHS = [self.csv]
+        try:
+            return apply_exact_csv_matches.load_csv_map()
+        finally:
+            apply_exact_csv_matches.CSV_PATHS = saved
+
+    def _write_exact_csv(self, email, url):
+        self.csv.write_text('Email_Sala,PublishedCalendarUrl,PublishedICalUrl\n'
+                            f'{email},{url},\n', encoding='utf-8')
+        st = self.csv.stat()
+        os.utime(self.csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    def test_exact_map_sidecar_replaced_after_csv_rewrite(self):
+        self._write_exact_csv('old@campus.utcluj.ro', 'https://example.org/a/')
+        self.assertEqual(self._load_exact(), {'example.org/a': 'old@campus.utcluj.ro'})
+        self._write_exact_csv('new@campus.utcluj.ro', 'https://example.org/b')
+        self.assertEqual(self._load_exact(), {'example.org/b': 'new@campus.utcluj.ro'})
+        sidecar = self.root / '.rooms.csv.exact_map.pkl'
+        self.assertEqual(pickle.loads(sidecar.read_bytes())[1], {'example.org/b': 'new@campus.utcluj.ro'})
+        self.assertEqual(self._leftovers(), [])
+
+    def test_exact_map_corrupt_sidecar_falls_back_to_parsing(self):
+        self._write_exact_csv('a@campus.utcluj.ro', 'http://example.org/c')
+        sidecar = self.root / '.rooms.csv.exact_map.pkl'
+        sidecar.write_bytes(pickle.dumps('truncated')[:-3])
+        self.assertEqual(self._load_exact(), {'example.org/c': 'a@campus.utcluj.ro'})
+        self.assertEqual(pickle.loads(sidecar.read_bytes())[1], {'example.org/c': 'a@campus.utcluj.ro'})
+
+
+if __name__ == '__main__':
+    unittest.main()
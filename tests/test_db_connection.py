@@ -0,0 +1,64 @@
+import unittest
+import tempfile
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class DbConnectionTests(unittest.TestCase):
+    def setUp(self):
+        # prevent background threads from starting when importing app
+        os.environ['DISABLE_BACKGROUND_TASKS'] = '1'
+        import app as app_module
+        self.app = app_module
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.app.DB_PATH = self.root / 'app.db'
+        self.app.init_db()
+
+    def tearDown(self):
+        try:
+            self.tmpdir.cleanup()
+        finally:
+            os.environ.pop('DISABLE_BACKGROUND_TASKS', None)
+
+    def assertClosed(self, conn):
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+
+    def test_thread_connection_closed_after_join(self):
+        seen = []
+
+        def worker():
+            conn = self.app.get_db_connection()
+            conn.execute('SELECT 1')
+            seen.append(conn)
+            # reused within the thread
+            seen.append(self.app.get_db_connection())
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertIs(seen[0], seen[1])
+        self.assertClosed(seen[0])
+        # this thread's own connection is unaffected
+        self.assertEqual(self.app.get_db_connection().execute('SELECT 1').fetchone()[0], 1)
+
+    def test_pool_worker_connections_closed_on_shutdown(self):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            conns = set(pool.map(lambda _: self.app.get_db_connection(), range(9)))
+        for conn in conns:
+            self.assertClosed(conn)
+
+    def test_db_path_change_closes_previous_connection(self):
+        first = self.app.get_db_connection()
+        self.app.DB_PATH = self.root / 'other.db'
+        second = self.app.get_db_connection()
+        self.assertIsNot(first, second)
+        self.assertClosed(first)
+
+
+if __name__ == '__main__':
+    unittest.main()
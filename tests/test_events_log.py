@@ -0,0 +1,164 @@
+import unittest
+import tempfile
+import json
+import os
+import base64
+import threading
+from pathlib import Path
+
+
+class EventsLogTests(unittest.TestCase):
+    def setUp(self):
+        # prevent background threads from starting when importing app
+        os.environ['DISABLE_BACKGROUND_TASKS'] = '1'
+        import app as app_module
+        self.app = app_module
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.app.DB_PATH = self.root / 'app.db'
+        (self.root / 'playwright_captures').mkdir(parents=True, exist_ok=True)
+        self.app.init_db()
+        self.events_file = self.root / 'playwright_captures' / 'events.json'
+        self.log_file = self.root / 'playwright_captures' / 'events.ndjson'
+        # the admin handlers use paths relative to the working directory
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        try:
+            os.chdir(self.cwd)
+            self.tmpdir.cleanup()
+        finally:
+            os.environ.pop('DISABLE_BACKGROUND_TASKS', None)
+
+    def _headers(self):
+        token = base64.b64encode(b'admin:admin123').decode('ascii')
+        return {'Authorization': f'Basic {token}'}
+
+    def _read_events(self):
+        with open(self.events_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_add_delete_fold_spares_identical_extractor_event(self):
+        extracted = {'start': '2030-01-07T10:00:00+02:00', 'end': None,
+                     'title': 'Lab', 'location': 'Sala 40'}
+        with open(self.events_file, 'w', encoding='utf-8') as f:
+            json.dump([extracted], f)
+
+        client = self.app.app.test_client()
+        resp = client.post('/admin/add_event', headers=self._headers(), data={
+            'title': 'Lab', 'start_date': '2030-01-07', 'start_time': '10:00', 'location': 'Sala 40'})
+        self.assertEqual(resp.status_code, 200)
+        man_id = resp.get_json()['id']
+        events = self._read_events()
+        self.assertEqual(len(events), 2)
+        self.assertTrue(events[1]['raw']['uid'])
+
+        resp = client.post('/admin/delete_event', headers=self._headers(), data={'id': str(man_id)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._read_events(), [extracted])
+        self.assertEqual(self.log_file.stat().st_size, 0)
+
+    def test_delete_by_index_keeps_concurrently_added_events(self):
+        self.app._dump_json_file(self.events_file, [{'title': 'extracted'}, {'title': 'other'}])
+
+        def worker():
+            for i in range(30):
+                self.app._append_manual_event_log(self._manual(f'w-{i}'), self.events_file)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        client = self.app.app.test_client()
+        resp = client.post('/admin/delete_event', headers=self._headers(), data={'index': '0'})
+        t.join()
+        self.assertEqual(resp.status_code, 200)
+        titles = [e['title'] for e in self._read_events()]
+        self.assertEqual(titles[0], 'other')
+        self.assertEqual(sorted(titles[1:]), sorted(f'ev w-{i}' for i in range(30)))
+
+        resp = client.post('/admin/delete_event', headers=self._headers(), data={'index': '99'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_tombstone_removes_only_its_uid(self):
+        a = {'start': 's', 'title': 't', 'location': 'l', 'raw': {'manual': True, 'uid': 'a'}}
+        b = {'start': 's', 'title': 't', 'location': 'l', 'raw': {'manual': True, 'uid': 'b'}}
+        events = self.app._apply_event_log([], [a, b, {'_deleted': {'uid': 'b'}}])
+        self.assertEqual(events, [a])
+
+    def test_legacy_tombstone_skips_extractor_events(self):
+        extracted = {'start': 's', 'title': 't', 'location': 'l'}
+        manual = {'start': 's', 'title': 't', 'location': 'l', 'raw': {'manual': True}}
+        gone = {'_deleted': {'start': 's', 'title': 't', 'location': 'l'}}
+        events = self.app._apply_event_log([extracted, manual], [gone, gone])
+        self.assertEqual(events, [extracted])
+
+    def _manual(self, uid):
+        return {'start': '2030-01-07T10:00:00+02:00', 'title': f'ev {uid}',
+                'location': 'Sala 40', 'raw': {'manual': True, 'uid': uid}}
+
+    def test_concurrent_appends_are_all_folded(self):
+        self.app._dump_json_file(self.events_file, [{'title': 'extracted'}])
+
+        def worker(n):
+            for i in range(20):
+                self.app._append_manual_event_log(self._manual(f'{n}-{i}'), self.events_file)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        events = self._read_events()
+        uids = [self.app._manual_event_uid(e) for e in events[1:]]
+        self.assertEqual(len(events), 161)
+        self.assertEqual(len(set(uids)), 160)
+        self.assertEqual(self.log_file.stat().st_size, 0)
+
+    def test_tombstone_folds_through_full_rewrite(self):
+        self.app._dump_json_file(self.events_file, [{'title': 'extracted'}])
+        for uid in ('a', 'b', 'c'):
+            self.app._append_manual_event_log(self._manual(uid), self.events_file)
+        self.app._append_manual_event_log({'_deleted': {'uid': 'b'}}, self.events_file)
+        self.assertEqual([e['title'] for e in self._read_events()], ['extracted', 'ev a', 'ev c'])
+        self.assertEqual(self.log_file.stat().st_size, 0)
+
+    def test_readers_merge_pending_log_without_writing(self):
+        self.app._dump_json_file(self.events_file, [self._manual('a')])
+        before = self.events_file.read_bytes()
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._manual('b')) + '\n')
+            f.write(json.dumps({'_deleted': {'uid': 'a'}}) + '\n')
+        merged = self.app._load_events_with_log(self.events_file)
+        self.assertEqual([e['title'] for e in merged], ['ev b'])
+        self.assertEqual(self.events_file.read_bytes(), before)
+        self.assertGreater(self.log_file.stat().st_size, 0)
+
+    def test_materialize_after_torn_append(self):
+        self.app._dump_json_file(self.events_file, [{'title': 'extracted'}])
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._manual('a')) + '\n')
+            f.write('{"start": "2030-01-07T1')  # writer died mid-line
+        # the next append starts on its own line instead of gluing onto it
+        self.app._append_manual_event_log(self._manual('b'), self.events_file)
+        self.assertEqual([e['title'] for e in self._read_events()], ['extracted', 'ev a', 'ev b'])
+        self.assertEqual(self.log_file.stat().st_size, 0)
+
+    def test_replayed_log_after_crash_is_not_applied_twice(self):
+        self.app._dump_json_file(self.events_file, [{'title': 'extracted'}])
+        lines = json.dumps(self._manual('a')) + '\n' + json.dumps(self._manual('b')) + '\n'
+        self.log_file.write_text(lines, encoding='utf-8')
+        self.app._materialize_events_json(self.events_file)
+        folded = self._read_events()
+        # crash between replacing events.json and truncating the log
+        self.log_file.write_text(lines + json.dumps(self._manual('c')) + '\n', encoding='utf-8')
+        self.app._materialize_events_json(self.events_file)
+        self.assertEqual(self._read_events(), folded + [self._manual('c')])
+        self.log_file.write_text(json.dumps({'_deleted': {'uid': 'a'}}) + '\n', encoding='utf-8')
+        self.app._materialize_events_json(self.events_file)
+        self.log_file.write_text(json.dumps({'_deleted': {'uid': 'a'}}) + '\n', encoding='utf-8')
+        self.app._materialize_events_json(self.events_file)
+        self.assertEqual([e['title'] for e in self._read_events()], ['extracted', 'ev b', 'ev c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import tempfile
+import json
+import os
+from pathlib import Path
+from datetime import date, timedelta
+
+
+class ScheduleEventsTests(unittest.TestCase):
+    def setUp(self):
+        # prevent background threads from starting when importing app
+        os.environ['DISABLE_BACKGROUND_TASKS'] = '1'
+        import app as app_module
+        self.app = app_module
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.app.DB_PATH = self.root / 'app.db'
+        self.app.init_db()
+
+        self.today = date.today()
+        self.tomorrow = self.today + timedelta(days=1)
+        schedule = {
+            '40': {
+                self.today.isoformat(): [{
+                    'start': self.today.isoformat() + 'T10:00:00',
+                    'end': self.today.isoformat() + 'T12:00:00',
+                    'title': 'Functional Programming - R. Slavescu (40)',
+                    'subject': 'Functional Programming',
+                    'professor': 'R. Slavescu',
+                    'parsed': {
+                        'subject': 'Functional Programming',
+                        'professor': 'R. Slavescu',
+                        'building': 'Baritiu',
+                        'room': 'BT5.03',
+                        'display_title': 'Functional programming',
+                    },
+                    'location': 'utcn_room_ac_bar_bt-503@campus.utcluj.ro',
+                    'source': 'abcd1234',
+                    'color': '#ff0000',
+                }],
+            },
+            '479': {
+                self.tomorrow.isoformat(): [{
+                    'start': self.tomorrow.isoformat() + 'T08:00:00',
+                    'end': self.tomorrow.isoformat() + 'T10:00:00',
+                    'title': 'Software engineering - E. Todoran',
+                    'subject': 'Software engineering',
+                    'location': 'utcn_room_ac_daic_479@campus.utcluj.ro',
+                    'professor': 'E. Todoran',
+                }],
+            },
+        }
+        self.jpath = self.root / 'schedule_by_room.json'
+        with open(self.jpath, 'w', encoding='utf-8') as f:
+            json.dump(schedule, f)
+
+    def tearDown(self):
+        try:
+            self.tmpdir.cleanup()
+        finally:
+            os.environ.pop('DISABLE_BACKGROUND_TASKS', None)
+
+    def test_materialize_and_filter(self):
+        self.assertTrue(self.app._materialize_schedule_events(self.jpath))
+
+        events = self.app._query_schedule_events(self.today, self.tomorrow)
+        self.assertEqual(len(events), 2)
+        first = events[0]
+        self.assertEqual(first['room'], 'BT5.03')
+        self.assertEqual(first['building'], 'Baritiu')
+        self.assertEqual(first['display_title'], 'Functional programming')
+        self.assertEqual(first['color'], '#ff0000')
+        self.assertNotIn('search_lc', first)
+
+        # date range, subject, professor and room filters are applied in SQL
+        self.assertEqual(len(self.app._query_schedule_events(self.today, self.today)), 1)
+        by_subject = self.app._query_schedule_events(self.today, self.tomorrow, subject_filter='software')
+        self.assertEqual([e['professor'] for e in by_subject], ['E. Todoran'])
+        by_prof = self.app._query_schedule_events(self.today, self.tomorrow, professor_filter='slavescu')
+        self.assertEqual(len(by_prof), 1)
+        by_room = self.app._query_schedule_events(self.today, self.tomorrow, room_filter='bt5')
+        self.assertEqual(len(by_room), 1)
+
+    def test_python_fallback_matches_sql(self):
+        self.app._materialize_schedule_events(self.jpath)
+        with open(self.jpath, 'r', encoding='utf-8') as f:
+            flat = self.app._flatten_schedule(json.load(f), {})
+        for kwargs in ({}, {'subject_filter': 'software'}, {'room_filter': '40'}):
+            self.assertEqual(
+                self.app._filter_schedule_events(flat, self.today, self.tomorrow, **kwargs),
+                self.app._query_schedule_events(self.today, self.tomorrow, **kwargs),
+            )
+
+    def test_builder_parsed_fields_match_parse_event(self):
+        """The stored 'parsed' fast path must serve what parse_event would."""
+        import sys
+        from datetime import datetime
+        tools_dir = str(Path(self.app.__file__).parent / 'tools')
+        if tools_dir not in sys.path:
+            sys.path.insert(0, tools_dir)
+        import build_schedule_by_room as builder
+        from tools.event_parser import parse_event
+
+        day = datetime.combine(self.today, datetime.min.time())
+        src = [
+            {'title': 'Programare Web (curs) - Prof. Ion Popescu',
+             'location': 'utcn_room_ac_bar_bt-503@campus.utcluj.ro', 'source': 'abcd1234'},
+            {'title': 'PCLP Lab 2/3 - A. Ionescu', 'location': 'Sala 40', 'source': 'ffff0000'},
+            {'title': 'FP p 40', 'location': None, 'source': None},
+        ]
+        events = []
+        for i, ev in enumerate(src):
+            ev = dict(ev, start=day.replace(hour=8 + 2 * i), end=day.replace(hour=9 + 2 * i))
+            events.append(ev)
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        try:
+            jpath, _ = builder.save_outputs(builder.build_schedule(events), self.root / 'out')
+        finally:
+            os.chdir(cwd)
+        with open(jpath, 'r', encoding='utf-8') as f:
+            schedule = json.load(f)
+
+        stripped = {
+            room: {d: [{k: v for k, v in e.items() if k != 'parsed'} for e in evs]
+                   for d, evs in days.items()}
+            for room, days in schedule.items()
+        }
+        for days in schedule.values():
+            for evs in days.values():
+                for e in evs:
+                    self.assertIsInstance(e.get('parsed'), dict)
+                    ref = parse_event({k: v for k, v in e.items() if k != 'parsed'})
+                    self.assertEqual(e['parsed']['subject'], ref['subject'] or '')
+                    self.assertEqual(e['parsed']['professor'], ref['professor'] or '')
+        self.assertEqual(self.app._flatten_schedule(schedule, {}),
+                         self.app._flatten_schedule(stripped, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from tools.apply_token_match import extract_key
+
+
+BASE = 'https://outlook.office365.com/owa/calendar'
+
+# url -> expected (owner lowercased, first 8 chars of the next segment);
+# these are the keys the original urlparse-based implementation produced.
+KEY_CASES = [
+    (f'{BASE}/0a1b2c3d4e5f@campus.utcluj.ro/9f8e7d6c5b4a3210/calendar.html',
+     ('0a1b2c3d4e5f@campus.utcluj.ro', '9f8e7d6c')),
+    # query string and fragment are not part of the path
+    (f'{BASE}/0a1b2c3d4e5f@campus.utcluj.ro/9f8e7d6c5b4a3210/calendar.ics?x=1&y=2',
+     ('0a1b2c3d4e5f@campus.utcluj.ro', '9f8e7d6c')),
+    (f'{BASE}/room@campus.utcluj.ro/abcdef12#frag', ('room@campus.utcluj.ro', 'abcdef12')),
+    (f'{BASE}/room@campus.utcluj.ro?h=abcdef12', None),
+    # trailing and doubled slashes
+    (f'{BASE}/Room_BT503@campus.utcluj.ro/ABCDEF0123456789/', ('room_bt503@campus.utcluj.ro', 'ABCDEF01')),
+    (f'{BASE}/room@campus.utcluj.ro//abcdef1234/calendar.html', ('room@campus.utcluj.ro', 'abcdef12')),
+    (f'{BASE}/room@campus.utcluj.ro/', None),
+    (f'{BASE}/room@campus.utcluj.ro', None),
+    # upper-case scheme/host; only the owner is lowercased, not the hash
+    ('HTTPS://OUTLOOK.OFFICE365.COM/owa/calendar/Room@Campus.UTCLUJ.ro/DeadBeefCafe/calendar.html',
+     ('room@campus.utcluj.ro', 'DeadBeef')),
+    # '@' in the netloc is not an owner
+    ('https://user@outlook.office365.com/owa/calendar/abc/def', None),
+    # scheme-less and protocol-relative URLs
+    ('outlook.office365.com/owa/calendar/room@campus.utcluj.ro/1234567890/calendar.ics',
+     ('room@campus.utcluj.ro', '12345678')),
+    ('//outlook.office365.com/owa/calendar/room@campus.utcluj.ro/1234567890/',
+     ('room@campus.utcluj.ro', '12345678')),
+    # first '@' segment wins; surrounding whitespace is ignored
+    (f'  {BASE}/a@b/c1/d@e/f  ', ('a@b', 'c1')),
+    (f'{BASE}/nohash/calendar.html', None),
+    ('', None),
+    (None, None),
+]
+
+
+class ExtractKeyTests(unittest.TestCase):
+    def test_extract_key_table(self):
+        for url, expected in KEY_CASES:
+            with self.subTest(url=url):
+                self.assertEqual(extract_key(url), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,13 +11,16 @@ Behavior:
 from __future__ import annotations
 
 import argparse
+import re
 import sys
-from collections import defaultdict
 from datetime import datetime, date, timedelta
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
 from typing import List, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from dateutil import parser as dtparser
 
 try:
@@ -25,17 +28,34 @@ try:
 except Exception:
     Calendar = None  # type: ignore
 
+# One keep-alive session for the whole run: main() fetches the page and then
+# usually the feed from the same host, which can then share a connection.
+# requests already advertises gzip/deflate via Accept-Encoding.
+_SESSION = requests.Session()
+
+# lxml builds the tree several times faster than the pure-Python parser;
+# fall back to html.parser when it is not installed.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except Exception:
+    HTML_PARSER = "html.parser"
+
 
 class Event:
+    # Feeds can hold thousands of events; slots drop the per-instance __dict__.
+    __slots__ = ("start", "end", "title", "location", "description", "_day")
+
     def __init__(self, start: datetime, end: Optional[datetime], title: str, location: Optional[str] = None, description: Optional[str] = None):
         self.start = start
         self.end = end
         self.title = title.strip() if title else ""
         self.location = location or ""
         self.description = description or ""
+        self._day = start.date()
 
     def day(self) -> date:
-        return self.start.date()
+        return self._day
 
     def timestr(self) -> str:
         if self.end:
@@ -43,34 +63,54 @@ class Event:
         return self.start.strftime('%H:%M')
 
 
+def _fast_parse(s: str) -> datetime:
+    """Parse an ISO 8601 timestamp, falling back to dateutil for anything else."""
+    try:
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        return datetime.fromisoformat(s)
+    except (ValueError, TypeError, AttributeError):
+        return dtparser.parse(s)
+
+
 def fetch(url: str) -> str:
-    resp = requests.get(url)
+    resp = _SESSION.get(url)
     resp.raise_for_status()
     return resp.text
 
 
+# Only <a>/<link> elements can point at a feed; skip building the rest of the tree.
+_FEED_LINK_STRAINER = SoupStrainer(["a", "link"])
+# Raw-HTML fallbacks for feed URLs outside <a>/<link> (e.g. inside scripts)
+_ICS_HTTP_RE = re.compile(r'(https?://[^"\s]+?\.ics)', re.IGNORECASE)
+_ICS_WEBCAL_RE = re.compile(r'(webcal://[^"\s]+?\.ics)', re.IGNORECASE)
+
+
 def find_ics_url_from_html(html: str, base_url: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    # First try anchors with .ics or webcal
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if href.lower().endswith(".ics") or href.lower().startswith("webcal:") or ".ics?" in href.lower():
-            # make absolute if needed
-            return requests.compat.urljoin(base_url, href)
-
-    # Some published pages embed a link rel="alternate" type="text/calendar"
-    for link in soup.find_all("link", href=True):
-        if link.get("type", "").startswith("text/calendar") or link.get("href", "").lower().endswith(".ics"):
-            return requests.compat.urljoin(base_url, link["href"])
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_FEED_LINK_STRAINER)
+    # One pass over anchors and links. Anchors with .ics or webcal win; the
+    # first matching link is only used when no anchor matches.
+    link_href = None
+    for tag in soup.find_all(("a", "link"), href=True):
+        href = tag["href"]
+        href_lc = href.lower()
+        if tag.name == "a":
+            if href_lc.endswith(".ics") or href_lc.startswith("webcal:") or ".ics?" in href_lc:
+                # make absolute if needed
+                return requests.compat.urljoin(base_url, href)
+        elif link_href is None:
+            # Some published pages embed a link rel="alternate" type="text/calendar"
+            if tag.get("type", "").startswith("text/calendar") or href_lc.endswith(".ics"):
+                link_href = href
+    if link_href is not None:
+        return requests.compat.urljoin(base_url, link_href)
 
     # Search raw HTML for any http(s)/webcal link that mentions .ics
-    import re
-
-    m = re.search(r'(https?://[^"\s]+?\.ics)', html, re.IGNORECASE)
+    m = _ICS_HTTP_RE.search(html)
     if m:
         return m.group(1)
 
-    m = re.search(r'(webcal://[^"\s]+?\.ics)', html, re.IGNORECASE)
+    m = _ICS_WEBCAL_RE.search(html)
     if m:
         return m.group(1)
 
@@ -86,6 +126,24 @@ def find_ics_url_from_html(html: str, base_url: str) -> Optional[str]:
     return None
 
 
+def _ics_text_to_events(text: str) -> List[Event]:
+    """Convert iCalendar text into Event objects (requires the ics library)."""
+    cal = Calendar(text)
+    events: List[Event] = []
+    for e in cal.events:
+        # ics.Event has .begin and .end as Arrow/pendulum-like objects
+        try:
+            start = e.begin.naive
+        except Exception:
+            start = _fast_parse(str(e.begin))
+        try:
+            end = e.end.naive if e.end else None
+        except Exception:
+            end = _fast_parse(str(e.end)) if e.end else None
+        events.append(Event(start=start, end=end, title=e.name or "", location=e.location or "", description=e.description or ""))
+    return events
+
+
 def parse_ics_from_url(ics_url: str, verbose: bool = False) -> List[Event]:
     """Try to fetch and parse an .ics URL.
 
@@ -95,27 +153,21 @@ def parse_ics_from_url(ics_url: str, verbose: bool = False) -> List[Event]:
         raise RuntimeError("ics library not installed; please pip install -r requirements.txt")
 
     headers = {"Accept": "text/calendar, text/plain, */*;q=0.1"}
-    resp = requests.get(ics_url, headers=headers)
-    resp.raise_for_status()
-
-    body = resp.text
-    ct = resp.headers.get("Content-Type", "")
-    # Quick detection: ICS files start with BEGIN:VCALENDAR
-    if body.lstrip().upper().startswith("BEGIN:VCALENDAR") or "text/calendar" in ct:
-        cal = Calendar(body)
-        events: List[Event] = []
-        for e in cal.events:
-            # ics.Event has .begin and .end as Arrow/pendulum-like objects
-            try:
-                start = e.begin.naive
-            except Exception:
-                start = dtparser.parse(str(e.begin))
-            try:
-                end = e.end.naive if e.end else None
-            except Exception:
-                end = dtparser.parse(str(e.end)) if e.end else None
-            events.append(Event(start=start, end=end, title=e.name or "", location=e.location or "", description=e.description or ""))
-        return events
+    # Stream the response so a non-ICS body (e.g. an HTML error page) is
+    # recognised from its first bytes without downloading and decoding it all.
+    with _SESSION.get(ics_url, headers=headers, stream=True) as resp:
+        resp.raise_for_status()
+        ct = resp.headers.get("Content-Type", "")
+        head = resp.raw.read(64, decode_content=True)
+        # Quick detection: ICS files start with BEGIN:VCALENDAR
+        is_ics = head.lstrip().upper().startswith(b"BEGIN:VCALENDAR") or "text/calendar" in ct
+        body = None
+        if is_ics or verbose:
+            # decode once, honouring a declared charset like resp.text would
+            body = (head + resp.raw.read(decode_content=True)).decode(resp.encoding or "utf-8", errors="replace")
+
+    if is_ics:
+        return _ics_text_to_events(body)
 
     # Not recognized as an ICS response
     if verbose:
@@ -127,19 +179,65 @@ def parse_ics_from_url(ics_url: str, verbose: bool = False) -> List[Event]:
     raise RuntimeError("Response from .ics URL did not contain an iCalendar. Try opening the URL in a browser or download the .ics manually.")
 
 
+# Microformat properties read from each .vevent, as CSS-like selector ->
+# (any of these classes, required tag name). Empty classes / None tag mean
+# "no constraint".
+_VEVENT_PROPS = {
+    ".summary, .fn": (("summary", "fn"), None),
+    ".dtstart": (("dtstart",), None),
+    "abbr.dtstart": (("dtstart",), "abbr"),
+    "time.dtstart": (("dtstart",), "time"),
+    ".start": (("start",), None),
+    "time": ((), "time"),
+    "abbr": ((), "abbr"),
+    ".dtend": (("dtend",), None),
+    "abbr.dtend": (("dtend",), "abbr"),
+    "time.dtend": (("dtend",), "time"),
+    ".end": (("end",), None),
+    ".location, .loc": (("location", "loc"), None),
+    ".description, .note": (("description", "note"), None),
+}
+
+
+def _vevent_nodes(ve: Tag) -> dict:
+    """Return the first descendant of `ve` matching each _VEVENT_PROPS selector.
+
+    Same result as one `ve.select_one(selector)` per property, but collected
+    in a single walk over the subtree.
+    """
+    found = {}
+    for node in ve.descendants:
+        if not isinstance(node, Tag):
+            continue
+        classes = node.get("class") or ()
+        for key, (cls, tag) in _VEVENT_PROPS.items():
+            if key in found:
+                continue
+            if tag is not None and node.name != tag:
+                continue
+            if cls and not any(c in classes for c in cls):
+                continue
+            found[key] = node
+        if len(found) == len(_VEVENT_PROPS):
+            break
+    return found
+
+
 def parse_microformat_vevents(html: str) -> List[Event]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     evs = []
     # Look for elements with class vevent
-    for ve in soup.select(".vevent"):
+    for ve in soup.find_all(class_="vevent"):
+        nodes = _vevent_nodes(ve)
+
         # summary/title
-        title_node = ve.select_one(".summary, .fn")
+        title_node = nodes.get(".summary, .fn")
         title = title_node.get_text(strip=True) if title_node else ve.get_text(strip=True)
 
         # dtstart / dtend (could be abbr[title] or time/datetime attributes)
         def extract_dt(selector_list):
             for sel in selector_list:
-                node = ve.select_one(sel)
+                node = nodes.get(sel)
                 if not node:
                     continue
                 # look for title attribute (often contains ISO datetime)
@@ -166,21 +264,21 @@ def parse_microformat_vevents(html: str) -> List[Event]:
             continue
 
         try:
-            start = dtparser.parse(start_s)
+            start = _fast_parse(start_s)
         except Exception:
             continue
 
         end = None
         if end_s:
             try:
-                end = dtparser.parse(end_s)
+                end = _fast_parse(end_s)
             except Exception:
                 end = None
 
-        loc_node = ve.select_one(".location, .loc")
+        loc_node = nodes.get(".location, .loc")
         location = loc_node.get_text(strip=True) if loc_node else None
 
-        desc_node = ve.select_one(".description, .note")
+        desc_node = nodes.get(".description, .note")
         description = desc_node.get_text(strip=True) if desc_node else None
 
         evs.append(Event(start=start, end=end, title=title, location=location, description=description))
@@ -193,19 +291,21 @@ def display_events(events: List[Event], from_date: Optional[date] = None, to_dat
         print("No events found.")
         return
 
-    events_sorted = sorted(events, key=lambda e: e.start)
-    grouped = defaultdict(list)
-    for e in events_sorted:
+    # Sort by (day, start) so each day's events are contiguous even when
+    # start times carry different UTC offsets, then stream them per day.
+    keyed = []
+    for e in events:
         d = e.day()
         if from_date and d < from_date:
             continue
         if to_date and d > to_date:
             continue
-        grouped[d].append(e)
+        keyed.append((d, e))
+    keyed.sort(key=lambda de: (de[0], de[1].start))
 
-    for d in sorted(grouped.keys()):
+    for d, group in groupby(keyed, key=itemgetter(0)):
         print(d.strftime("%A, %Y-%m-%d"))
-        for e in grouped[d]:
+        for _, e in group:
             loc = f" @ {e.location}" if e.location else ""
             print(f"  {e.timestr():10}  {e.title}{loc}")
         print()
@@ -228,21 +328,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     # If user passed a local .ics file path, parse it directly
     if os.path.exists(args.url) and args.url.lower().endswith(".ics"):
         try:
-            with open(args.url, "r", encoding="utf-8") as f:
-                text = f.read()
             if Calendar is None:
                 raise RuntimeError("ics library not available; install dependencies")
-            cal = Calendar(text)
-            for e in cal.events:
-                try:
-                    start = e.begin.naive
-                except Exception:
-                    start = dtparser.parse(str(e.begin))
-                try:
-                    end = e.end.naive if e.end else None
-                except Exception:
-                    end = dtparser.parse(str(e.end)) if e.end else None
-                events.append(Event(start=start, end=end, title=e.name or "", location=e.location or "", description=e.description or ""))
+            events = _ics_text_to_events(Path(args.url).read_text(encoding="utf-8"))
         except Exception as e:
             print(f"Failed to parse local .ics file: {e}")
             return 3
@@ -273,12 +361,12 @@ def main(argv: Optional[List[str]] = None) -> int:
     from_d = None
     to_d = None
     if args.from_date:
-        from_d = dtparser.parse(args.from_date).date()
+        from_d = _fast_parse(args.from_date).date()
     else:
         from_d = today
 
     if args.to_date:
-        to_d = dtparser.parse(args.to_date).date()
+        to_d = _fast_parse(args.to_date).date()
     else:
         to_d = from_d + timedelta(days=args.days - 1)
 
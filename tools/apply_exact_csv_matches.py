@@ -14,20 +14,23 @@ Behavior:
 """
 import csv
 import json
+import os
+import pickle
 import re
 import sqlite3
+import tempfile
 from pathlib import Path
 
 CSV_PATHS = [Path('config') / 'Rooms_PUBLISHER_HTML-ICS(in).csv', Path('Rooms_PUBLISHER_HTML-ICS(in).csv')]
 DB_PATH = Path('data') / 'app.db'
+_SCHEME_RE = re.compile(r'^https?://', re.I)
 
 
 def normalize_url(u: str) -> str:
     if not u:
         return ''
-    u = u.strip()
     # remove scheme
-    u = re.sub(r'^https?://', '', u, flags=re.I)
+    u = _SCHEME_RE.sub('', u.strip())
     # remove trailing slash
     if u.endswith('/'):
         u = u[:-1]
@@ -38,6 +41,19 @@ def load_csv_map():
     p = next((pp for pp in CSV_PATHS if pp.exists()), None)
     if not p:
         raise SystemExit(f"CSV not found at any of: {CSV_PATHS}")
+    # The parsed map is pickled next to the CSV and reused while the CSV's
+    # mtime and size are unchanged; a stale or unreadable sidecar is removed
+    # and replaced atomically.
+    st = p.stat()
+    sig = (1, st.st_mtime_ns, st.st_size)
+    cache = p.with_name(f'.{p.name}.exact_map.pkl')
+    try:
+        cached_sig, cached = pickle.loads(cache.read_bytes())
+        if cached_sig == sig:
+            return cached
+    except Exception:
+        pass
+    cache.unlink(missing_ok=True)
     m = {}
     with p.open(newline='') as fh:
         rdr = csv.DictReader(fh)
@@ -49,6 +65,15 @@ def load_csv_map():
                 m[normalize_url(cal)] = email
             if ical:
                 m[normalize_url(ical)] = email
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=cache.parent, prefix=cache.name + '.')
+        with os.fdopen(fd, 'wb') as fh:
+            pickle.dump((sig, m), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError:
+        if tmp:
+            Path(tmp).unlink(missing_ok=True)
     return m
 
 
@@ -56,21 +81,37 @@ def apply_matches(csv_map):
     if not DB_PATH.exists():
         raise SystemExit(f"DB not found at {DB_PATH}")
     conn = sqlite3.connect(str(DB_PATH))
+    # Same opt-in as the app (SQLITE_WAL_MODE): WAL + NORMAL sync means the
+    # batch commit costs one WAL fsync instead of a rollback-journal cycle.
+    if os.environ.get('SQLITE_WAL_MODE', ''):
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
     cur = conn.cursor()
     cur.execute("PRAGMA table_info(calendars)")
     cols = [r[1] for r in cur.fetchall()]
     if 'email_address' not in cols:
         cur.execute('ALTER TABLE calendars ADD COLUMN email_address TEXT')
 
-    cur.execute('SELECT id, url, email_address FROM calendars')
+    # Match inside SQLite: the CSV map goes into an indexed temp table and
+    # only calendars whose normalized URL maps to a different email come back.
+    conn.create_function('normalize_url', 1, normalize_url, deterministic=True)
+    cur.execute('CREATE TEMP TABLE csvmap(nurl TEXT PRIMARY KEY, email TEXT)')
+    cur.executemany('INSERT INTO csvmap(nurl, email) VALUES (?, ?)',
+                    [(n, e) for n, e in csv_map.items() if e])
+    cur.execute(
+        'SELECT c.id, c.url, c.email_address, m.email FROM calendars c '
+        'JOIN csvmap m ON m.nurl = normalize_url(c.url) '
+        'WHERE c.email_address IS NOT m.email ORDER BY c.id'
+    )
     updates = []
-    for cid, url, cur_email in cur.fetchall():
-        n = normalize_url(url)
-        csv_email = csv_map.get(n)
-        if csv_email:
-            if cur_email != csv_email:
-                updates.append({'id': cid, 'old': cur_email, 'new': csv_email, 'url': url})
-                cur.execute('UPDATE calendars SET email_address=? WHERE id=?', (csv_email, cid))
+    pending = []
+    for cid, url, cur_email, csv_email in cur.fetchall():
+        updates.append({'id': cid, 'old': cur_email, 'new': csv_email, 'url': url})
+        pending.append((csv_email, cid))
+    # one statement for the whole batch, committed as a single transaction
+    if pending:
+        cur.executemany('UPDATE calendars SET email_address=? WHERE id=?', pending)
     conn.commit()
     conn.close()
     return updates
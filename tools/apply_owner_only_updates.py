@@ -10,6 +10,7 @@ This script:
 Backed-up DB must exist (created before running).
 """
 import json
+import os
 import sqlite3
 from pathlib import Path
 
@@ -28,6 +29,11 @@ def main():
         print('No owner_only proposals found')
         return
     conn = sqlite3.connect(str(DB))
+    # WAL/NORMAL only when the app runs with SQLITE_WAL_MODE too
+    if os.environ.get('SQLITE_WAL_MODE', ''):
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
     cur = conn.cursor()
     # ensure email_address column exists
     cur.execute("PRAGMA table_info(calendars)")
@@ -35,17 +41,21 @@ def main():
     if 'email_address' not in cols:
         print('email_address column not present in DB; adding it (NULLable)')
         cur.execute('ALTER TABLE calendars ADD COLUMN email_address TEXT')
+    # ids still without an email; a proposal fills each at most once
+    cur.execute('SELECT id FROM calendars WHERE email_address IS NULL')
+    unset = {r[0] for r in cur.fetchall()}
     applied = []
+    pending = []
     for p in props:
         pid = p['id']
         email = p['proposed_email']
-        cur.execute('SELECT email_address FROM calendars WHERE id=?', (pid,))
-        row = cur.fetchone()
-        if not row:
+        if pid not in unset:
             continue
-        if row[0] is None:
-            cur.execute('UPDATE calendars SET email_address=? WHERE id=?', (email, pid))
-            applied.append({'id': pid, 'email': email})
+        unset.discard(pid)
+        pending.append((email, pid))
+        applied.append({'id': pid, 'email': email})
+    if pending:
+        cur.executemany('UPDATE calendars SET email_address=? WHERE id=?', pending)
     conn.commit()
     conn.close()
     print({'applied_count': len(applied), 'applied': applied})
@@ -7,9 +7,12 @@ This will update calendars.email_address for rows where email_address is current
 """
 import csv
 import os
+import pickle
+import re
 import sqlite3
+import sys
 import json
-from urllib.parse import urlparse
+import tempfile
 
 
 CSV_CANDIDATES = [
@@ -26,6 +29,11 @@ def find_csv_path():
     return None
 
 
+# First path segment containing '@' (the owner mailbox) and the next
+# non-empty segment after it.
+_TOKEN_RE = re.compile(r'/([^/]*@[^/]*)/+([^/]+)')
+
+
 def extract_owner_and_hash(url: str):
     """Return (owner_email, hash_segment) or (None,None).
     owner_email is the path segment containing '@campus.utcluj.ro' (or '@').
@@ -33,28 +41,52 @@ def extract_owner_and_hash(url: str):
     """
     if not url:
         return None, None
-    try:
-        u = url.strip()
-        # strip query and fragment
-        p = urlparse(u)
-        path = p.path
-        parts = [seg for seg in path.split('/') if seg]
-        owner = None
-        h = None
-        for i,seg in enumerate(parts):
-            if '@' in seg:
-                owner = seg
-                # next segment if exists
-                if i+1 < len(parts):
-                    h = parts[i+1]
-                break
-        return owner, h
-    except Exception:
+    # path only: drop fragment, query and scheme://netloc
+    u = url.strip().split('#', 1)[0].split('?', 1)[0]
+    scheme_end = u.find('://')
+    netloc_start = scheme_end + 3 if scheme_end != -1 else (2 if u.startswith('//') else -1)
+    if netloc_start != -1:
+        slash = u.find('/', netloc_start)
+        u = u[slash:] if slash != -1 else ''
+    m = _TOKEN_RE.search('/' + u)
+    if not m:
         return None, None
+    return m.group(1), m.group(2)
+
+
+def extract_key(url: str):
+    """Return the (owner lowercased, hash prefix) match key for url, or None.
+
+    Owner strings repeat across many rows, so they are interned to make the
+    index lookups hash/compare cheaper.
+    """
+    owner, h = extract_owner_and_hash(url)
+    if not owner or not h:
+        return None
+    return sys.intern(owner.lower()), h[:8]
 
 
 def build_csv_index(csv_path):
-    """Build index mapping (owner, hash_prefix) -> email. Detect ambiguous keys."""
+    """Build index mapping (owner, hash_prefix) -> email. Detect ambiguous keys.
+
+    The result is pickled next to the CSV and reused while the CSV's mtime
+    and size are unchanged; a stale or unreadable sidecar is removed and
+    replaced atomically.
+    """
+    st = os.stat(csv_path)
+    sig = (1, st.st_mtime_ns, st.st_size)
+    cache = os.path.join(os.path.dirname(csv_path), '.' + os.path.basename(csv_path) + '.token_idx.pkl')
+    try:
+        with open(cache, 'rb') as f:
+            cached_sig, cached = pickle.load(f)
+        if cached_sig == sig:
+            return cached
+    except Exception:
+        pass
+    try:
+        os.unlink(cache)
+    except OSError:
+        pass
     index = {}
     ambiguous = set()
     rows = 0
@@ -70,39 +102,57 @@ def build_csv_index(csv_path):
             for src in (html, ics):
                 if not src:
                     continue
-                owner, h = extract_owner_and_hash(src)
-                if not owner or not h:
+                key = extract_key(src)
+                if key is None:
                     continue
-                key = (owner.lower(), h[:8])
                 if key in index:
                     if index[key] != email:
                         ambiguous.add(key)
                         index[key] = None
                 else:
                     index[key] = email
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache) or '.', prefix=os.path.basename(cache) + '.')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((sig, (index, ambiguous, rows)), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError:
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
     return index, ambiguous, rows
 
 
 def apply_matches(db_path, index, ambiguous):
     conn = sqlite3.connect(db_path)
+    # match the app: WAL + synchronous=NORMAL only under SQLITE_WAL_MODE
+    if os.environ.get('SQLITE_WAL_MODE', ''):
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
     cur = conn.cursor()
     cur.execute('SELECT id, url, email_address FROM calendars ORDER BY id')
     rows = cur.fetchall()
     updates = []
+    pending = []
     applied = 0
     for rid, url, current in rows:
         if current is not None:
             continue
-        owner, h = extract_owner_and_hash(url or '')
-        if not owner or not h:
+        key = extract_key(url or '')
+        if key is None:
             continue
-        key = (owner.lower(), h[:8])
         if key in ambiguous:
             continue
         if key in index and index[key]:
-            cur.execute('UPDATE calendars SET email_address=? WHERE id=?', (index[key], rid))
+            pending.append((index[key], rid))
             updates.append({'id': rid, 'url': url, 'new': index[key]})
             applied += 1
+    if pending:
+        cur.executemany('UPDATE calendars SET email_address=? WHERE id=?', pending)
     conn.commit()
     conn.close()
     return updates
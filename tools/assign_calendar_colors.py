@@ -5,7 +5,7 @@ Colors are chosen deterministically from a palette using a hash of the URL so
 re-running the script won't reassign different colors and will avoid duplication.
 """
 import sqlite3
-import hashlib
+import zlib
 from pathlib import Path
 
 DB_PATH = Path('data') / 'app.db'
@@ -17,9 +17,9 @@ PALETTE = [
 
 
 def pick_color_for_url(url: str) -> str:
-    h = hashlib.sha1(url.encode('utf-8')).hexdigest()
-    v = int(h[:8], 16)
-    return PALETTE[v % len(PALETTE)]
+    # crc32 is stable across runs (unlike hash()) and far cheaper than SHA-1;
+    # only the spread over the palette matters here
+    return PALETTE[zlib.crc32(url.encode('utf-8')) % len(PALETTE)]
 
 
 def assign_colors():
@@ -29,18 +29,16 @@ def assign_colors():
 
     with sqlite3.connect(str(DB_PATH)) as conn:
         cur = conn.cursor()
-        cur.execute('SELECT id, url, name, color FROM calendars')
-        rows = cur.fetchall()
-        updated = 0
-        for r in rows:
-            cid, url, name, color = r
-            if color and str(color).strip():
-                continue
-            if not url:
-                continue
-            col = pick_color_for_url(url)
-            cur.execute('UPDATE calendars SET color = ? WHERE id = ?', (col, cid))
-            updated += 1
+        # only calendars with a URL and no (or blank) color
+        cur.execute(
+            "SELECT id, url FROM calendars "
+            "WHERE (color IS NULL OR TRIM(color, ' ' || char(9, 10, 13)) = '') "
+            "AND url IS NOT NULL AND url <> ''"
+        )
+        pending = [(pick_color_for_url(url), cid) for cid, url in cur.fetchall()]
+        if pending:
+            cur.executemany('UPDATE calendars SET color = ? WHERE id = ?', pending)
+        updated = len(pending)
         conn.commit()
 
     print(f'Assigned colors to {updated} calendars')
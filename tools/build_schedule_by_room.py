@@ -29,14 +29,17 @@ import csv
 import json
 import os
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 import pathlib
 import re
 from dateutil import parser as dtparser
 import sys
+import tempfile
 
 # Import parserul inteligent pentru subiecte
 from subject_parser import get_parser, parse_title, get_mappings
+from event_parser import parse_event
 
 # Ensure stdout/stderr use UTF-8 where the platform default may be cp1252 (Windows).
 try:
@@ -363,14 +366,25 @@ def build_schedule(events):
         day = st.date().isoformat()
         # capture professor if available from the loaded events or parsed from title
         prof = ev.get('professor') or professor or None
+        stored_title = display_title or title  # Folosește titlul formatat
+        source = ev.get('source') if isinstance(ev, dict) else None
+        # Run parse_event once here, on exactly the fields /events.json would
+        # hand it for this record (stored title, location, source), so the
+        # app can serve the result instead of re-parsing on every request.
+        try:
+            p = parse_event({'title': stored_title, 'location': location, 'source': source})
+            parsed = {k: p.get(k) or '' for k in ('subject', 'professor', 'building', 'room', 'display_title')}
+        except Exception:
+            parsed = None
         schedule[room][day].append({
             'start': st,
             'end': end,
-            'title': display_title or title,  # Folosește titlul formatat
+            'title': stored_title,
             'subject': subj,
             'location': location,
             'professor': prof,
-            'source': ev.get('source') if isinstance(ev, dict) else None,
+            'parsed': parsed,
+            'source': source,
             'color': ev.get('color') if isinstance(ev, dict) else None,
         })
 
@@ -402,7 +416,7 @@ def save_outputs(schedule, out_dir: pathlib.Path):
         for day, evs in days.items():
             serial[out_room][day] = []
             for e in evs:
-                serial[out_room][day].append({
+                rec = {
                     'start': e['start'].isoformat() if e['start'] else None,
                     'end': e['end'].isoformat() if e['end'] else None,
                     'title': e['title'],
@@ -410,14 +424,20 @@ def save_outputs(schedule, out_dir: pathlib.Path):
                     'location': e['location'],
                     'professor': e.get('professor'),
                     'source': e.get('source'),
-                    'color': e.get('color')
-                })
-    with open(jpath, 'w', encoding='utf-8') as f:
+                    'color': e.get('color'),
+                }
+                if e.get('parsed') is not None:
+                    # parse_event output for this record (app fast path)
+                    rec['parsed'] = e['parsed']
+                serial[out_room][day].append(rec)
+    # Write to a temp file and rename so readers (the web app re-reads this
+    # file whenever its mtime changes) never observe a half-written schedule.
+    with _atomic_open(jpath) as f:
         json.dump(serial, f, indent=2, ensure_ascii=False)
 
     # also CSV: room, date, start, end, subject, title, location
     cpath = out_dir / 'schedule_by_room.csv'
-    with open(cpath, 'w', encoding='utf-8', newline='') as f:
+    with _atomic_open(cpath, newline='') as f:
         w = csv.writer(f)
         w.writerow(['room', 'date', 'start', 'end', 'subject', 'professor', 'title', 'location'])
         for room, days in serial.items():
@@ -428,6 +448,31 @@ def save_outputs(schedule, out_dir: pathlib.Path):
     return jpath, cpath
 
 
+@contextmanager
+def _atomic_open(path: pathlib.Path, newline=None):
+    """Open a unique sibling temp file for writing; os.replace() it onto `path` on success.
+
+    Builds may run concurrently (upload handler, ensure_schedule, the regen
+    thread), so each one gets its own mkstemp file instead of a shared
+    `<name>.tmp`; the temp file is removed if writing fails.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.')
+    try:
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates 0600
+        except OSError:
+            pass
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def pretty_print(schedule):
     # apply aliases for printing if available
     aliases_path = pathlib.Path('config') / 'room_aliases.json'
@@ -476,9 +521,23 @@ def load_all_events(source_path: str):
     
     if event_files:
         print(f'Found {len(event_files)} calendar event files')
+        # calendar_map.json holds the current per-calendar color; the admin
+        # UI updates only the map when just the color changes.
+        try:
+            with open(out_dir / 'calendar_map.json', 'r', encoding='utf-8') as f:
+                cmap = json.load(f)
+            if not isinstance(cmap, dict):
+                cmap = {}
+        except Exception:
+            cmap = {}
         for ef in event_files:
             try:
                 events = load_events(str(ef))
+                meta = cmap.get(ef.stem[len('events_'):])
+                color = meta.get('color') if isinstance(meta, dict) else None
+                if color:
+                    for e in events:
+                        e['color'] = color
                 print(f'  Loaded {len(events)} events from {ef.name}')
                 all_events.extend(events)
             except Exception as e:
@@ -22,6 +22,7 @@ from collections import defaultdict
 
 CSV_PATHS = [Path('config') / 'Rooms_PUBLISHER_HTML-ICS(in).csv', Path('Rooms_PUBLISHER_HTML-ICS(in).csv')]
 DB_PATH = Path('data') / 'app.db'
+_SCHEME_RE = re.compile(r'^https?://', re.I)
 
 
 def load_csv_rows():
@@ -41,7 +42,7 @@ def csv_key_tokens(url):
     if not url:
         return (None, None)
     # strip scheme
-    u = re.sub(r'^https?://', '', url.strip(), flags=re.I)
+    u = _SCHEME_RE.sub('', url.strip())
     parts = u.split('/')
     # look for a part that contains '@'
     owner = None
@@ -17,13 +17,13 @@ from pathlib import Path
 
 CSV_PATHS = [Path('Rooms_PUBLISHER_HTML-ICS(in).csv'), Path('config') / 'Rooms_PUBLISHER_HTML-ICS(in).csv']
 DB_PATH = Path('data') / 'app.db'
+_SCHEME_RE = re.compile(r'^https?://', re.I)
 
 
 def normalize_url(u: str) -> str:
     if not u:
         return ''
-    u = u.strip()
-    u = re.sub(r'^https?://', '', u, flags=re.I)
+    u = _SCHEME_RE.sub('', u.strip())
     if u.endswith('/'):
         u = u[:-1]
     return u.lower()
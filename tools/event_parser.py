@@ -10,7 +10,9 @@ import re
 import json
 import pathlib
 from dataclasses import dataclass
-from typing import Optional, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping
 
 # Mapping-uri pentru clădiri UTCN
 BUILDING_ALIASES = {
@@ -48,9 +50,9 @@ ROOM_PREFIXES = {
 }
 
 
-@dataclass
+@dataclass(frozen=True)
 class ParsedEvent:
-    """Rezultatul parsării unui eveniment."""
+    """Rezultatul parsării unui eveniment (imutabil: parse_title_cached îl partajează)."""
     subject: str = ''           # Materia (nume complet sau abreviere)
     abbreviation: str = ''      # Abrevierea materiei
     professor: str = ''         # Numele profesorului
@@ -181,10 +183,13 @@ def parse_title(title: str) -> ParsedEvent:
         3. "ABREV Sala [In-person]" -> subject=ABREV, room=Sala
         4. "Materie" -> subject=Materie
     """
-    result = ParsedEvent(original_title=title)
+    # ParsedEvent e imutabil (rezultatele cache-uite sunt partajate), deci
+    # câmpurile se adună într-un dict și obiectul se construiește la final.
+    original_title = title
+    result = {}
     
     if not title:
-        return result
+        return ParsedEvent(original_title=original_title)
     
     # Curăță titlul
     title = title.strip()
@@ -192,13 +197,13 @@ def parse_title(title: str) -> ParsedEvent:
     # Extrage [In-person], [Online] etc
     type_match = re.search(r'\[([^\]]+)\]', title)
     if type_match:
-        result.event_type = type_match.group(1).strip()
+        result['event_type'] = type_match.group(1).strip()
         title = title[:type_match.start()].strip()
     
     # Verifică dacă e laborator/seminar
     title_lower = title.lower()
     if ' p ' in f' {title_lower} ' or 'seminar' in title_lower or 'lab' in title_lower:
-        result.is_lab = True
+        result['is_lab'] = True
     
     # Încearcă formatul complet: "Nume materie (ABREV) - Profesor - Sala"
     full_match = re.match(
@@ -207,18 +212,18 @@ def parse_title(title: str) -> ParsedEvent:
         re.IGNORECASE
     )
     if full_match:
-        result.subject = full_match.group(1).strip()
-        result.abbreviation = full_match.group(2).upper()
-        result.professor = full_match.group(3).strip() if full_match.group(3) else ''
+        result['subject'] = full_match.group(1).strip()
+        result['abbreviation'] = full_match.group(2).upper()
+        result['professor'] = full_match.group(3).strip() if full_match.group(3) else ''
         if full_match.group(4):
-            result.room_code = full_match.group(4).strip()
-        result.display_title = result.subject
-        return result
+            result['room_code'] = full_match.group(4).strip()
+        result['display_title'] = result['subject']
+        return ParsedEvent(original_title=original_title, **result)
     
     # Încearcă formatul simplu cu liniuță: "Materie - Profesor"
     if ' - ' in title:
         parts = title.split(' - ', 1)
-        result.subject = parts[0].strip()
+        result['subject'] = parts[0].strip()
         
         # Partea după - poate fi profesor sau poate conține și sala
         if len(parts) > 1:
@@ -226,27 +231,27 @@ def parse_title(title: str) -> ParsedEvent:
             
             # Dacă e gol (doar "Materie - "), nu avem profesor
             if not after_dash:
-                result.display_title = result.subject
-                return result
+                result['display_title'] = result['subject']
+                return ParsedEvent(original_title=original_title, **result)
             
             # Verifică dacă e "Profesor - Sala" sau doar "Profesor"
             if ' - ' in after_dash:
                 prof_parts = after_dash.split(' - ', 1)
-                result.professor = prof_parts[0].strip()
-                result.room_code = prof_parts[1].strip() if len(prof_parts) > 1 else ''
+                result['professor'] = prof_parts[0].strip()
+                result['room_code'] = prof_parts[1].strip() if len(prof_parts) > 1 else ''
             else:
                 # Poate fi profesor sau poate fi gol (doar liniuță)
                 if after_dash:
-                    result.professor = after_dash
+                    result['professor'] = after_dash
         
-        result.display_title = result.subject
-        return result
+        result['display_title'] = result['subject']
+        return ParsedEvent(original_title=original_title, **result)
     
     # Verifică dacă titlul se termină cu " - " (fără profesor)
     if title.rstrip().endswith(' -') or title.rstrip().endswith('-'):
-        result.subject = title.rstrip().rstrip('-').strip()
-        result.display_title = result.subject
-        return result
+        result['subject'] = title.rstrip().rstrip('-').strip()
+        result['display_title'] = result['subject']
+        return ParsedEvent(original_title=original_title, **result)
     
     # Format scurt: "ABREV Sala" sau "ABREV p Sala" (laborator)
     # ABREV trebuie să fie uppercase (ex: "FP", "AI", "SCS")
@@ -258,16 +263,28 @@ def parse_title(title: str) -> ParsedEvent:
         abbrev = short_match.group(1)
         # Verifică că e efectiv o abreviere (toate literele uppercase)
         if abbrev.isupper():
-            result.abbreviation = abbrev
-            result.subject = result.abbreviation  # Folosim abrevierea ca subject
-            result.room_code = short_match.group(2).strip()
-            result.display_title = result.abbreviation
-            return result
+            result['abbreviation'] = abbrev
+            result['subject'] = result['abbreviation']  # Folosim abrevierea ca subject
+            result['room_code'] = short_match.group(2).strip()
+            result['display_title'] = result['abbreviation']
+            return ParsedEvent(original_title=original_title, **result)
     
     # Fallback: titlul e doar materia
-    result.subject = title
-    result.display_title = title
-    return result
+    result['subject'] = title
+    result['display_title'] = title
+    return ParsedEvent(original_title=original_title, **result)
+
+
+# Variante cu cache: același titlu/aceeași locație se repetă la fiecare
+# recurență săptămânală, deci regex-urile rulează o singură dată per valoare.
+# Rezultatele sunt partajate între apelanți și trebuie tratate ca read-only.
+parse_title_cached = lru_cache(maxsize=4096)(parse_title)
+
+
+@lru_cache(maxsize=2048)
+def parse_location_cached(location: str) -> Mapping[str, str]:
+    """Ca parse_location(), dar memorat și returnat ca mapping read-only."""
+    return MappingProxyType(parse_location(location))
 
 
 def parse_event(event: dict) -> dict:
@@ -291,7 +308,7 @@ def parse_event(event: dict) -> dict:
         if subject_raw:
             title = subject_raw
     
-    parsed_title = parse_title(title)
+    parsed_title = parse_title_cached(title)
     result['subject'] = parsed_title.subject
     result['abbreviation'] = parsed_title.abbreviation
     result['professor'] = parsed_title.professor
@@ -314,7 +331,7 @@ def parse_event(event: dict) -> dict:
                 elif not location:
                     location = raw_display
     
-    parsed_loc = parse_location(location)
+    parsed_loc = parse_location_cached(location)
     result['building'] = parsed_loc.get('building', '')
     result['room'] = parsed_loc.get('room', '') or parsed_title.room_code
     
@@ -459,6 +476,12 @@ def parse_group_from_string(s: str) -> Dict[str, str]:
     return out
 
 
+@lru_cache(maxsize=2048)
+def parse_group_cached(s: str) -> Mapping[str, str]:
+    """Ca parse_group_from_string(), dar memorat și returnat ca mapping read-only."""
+    return MappingProxyType(parse_group_from_string(s))
+
+
 # Funcții de compatibilitate cu vechiul API
 def parse_title_compat(title: str) -> dict:
     """Compatibilitate cu vechiul API parse_title()."""
@@ -23,11 +23,12 @@ if '/app' not in sys.path:
 from timetable import parse_ics_from_url
 
 
-def find_csv_path():
+def find_csv_path(base_dir=None):
+    base = Path(base_dir) if base_dir else Path('.')
     candidates = [
-        Path('config/Rooms_PUBLISHER_HTML-ICS(in).csv'),
-        Path('Rooms_PUBLISHER_HTML-ICS(in).csv'),
-        Path('playwright_captures/Rooms_PUBLISHER_HTML-ICS(in).csv'),
+        base / 'config/Rooms_PUBLISHER_HTML-ICS(in).csv',
+        base / 'Rooms_PUBLISHER_HTML-ICS(in).csv',
+        base / 'playwright_captures/Rooms_PUBLISHER_HTML-ICS(in).csv',
     ]
     for p in candidates:
         if p.exists():
@@ -35,13 +36,14 @@ def find_csv_path():
     return None
 
 
-def main():
-    csvp = find_csv_path()
+def main(base_dir=None):
+    """Run the repair relative to `base_dir` (default: current directory)."""
+    csvp = find_csv_path(base_dir)
     if not csvp:
         print('No publisher CSV found; nothing to repair')
         return 2
 
-    outdir = Path('playwright_captures')
+    outdir = (Path(base_dir) if base_dir else Path('.')) / 'playwright_captures'
     outdir.mkdir(exist_ok=True)
 
     urls = []
@@ -9,7 +9,14 @@ import sqlite3
 import csv
 import sys
 
-def main():
+def main(db_path=None, replace=False):
+    """Populate the calendars table; returns a process exit code.
+
+    `db_path` defaults to data/app.db next to the project root. The web app
+    calls this in-process with its own DB_PATH after a CSV upload, passing
+    replace=True: calendars, manual and extracurricular events are then
+    cleared and the CSV rows inserted in a single transaction.
+    """
     # Find the CSV file
     csv_filename = 'Rooms_PUBLISHER_HTML-ICS(in).csv'
     csv_paths = [
@@ -25,7 +32,7 @@ def main():
 
     if not csv_path:
         print(f"Error: CSV file '{csv_filename}' not found.")
-        sys.exit(1)
+        return 1
 
     print(f"Using CSV: {csv_path}")
 
@@ -79,14 +86,44 @@ def main():
     print(f"Found {len(urls)} unique URLs ({len(html_urls_by_url)} with HTML fallback)")
 
     # Connect to DB
-    db_path = pathlib.Path(__file__).parent.parent / 'data' / 'app.db'
+    if db_path is None:
+        db_path = pathlib.Path(__file__).parent.parent / 'data' / 'app.db'
+    db_path = pathlib.Path(db_path)
     if not db_path.exists():
         print(f"Error: DB file '{db_path}' not found.")
-        sys.exit(1)
+        return 1
 
     conn = sqlite3.connect(str(db_path))
     cur = conn.cursor()
 
+    if replace:
+        # Fresh tables: every CSV row is new, so one batched INSERT gives the
+        # same result as the per-row insert/update loop below.
+        rows = [(url,
+                 names_by_url.get(url, f'Calendar {url.split("/")[-1]}'),
+                 buildings_by_url.get(url) or None,
+                 emails_by_url.get(url) or None,
+                 html_urls_by_url.get(url) or None)
+                for url in urls]
+        try:
+            cur.execute('BEGIN')
+            for table in ('calendars', 'manual_events', 'extracurricular_events'):
+                try:
+                    cur.execute(f'DELETE FROM {table}')
+                except sqlite3.OperationalError:
+                    pass  # table not created yet
+            cur.executemany('INSERT OR IGNORE INTO calendars (url, name, building, email_address, html_url, enabled, created_at) VALUES (?, ?, ?, ?, ?, 1, datetime("now"))', rows)
+            added = cur.rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            print(f"Error replacing calendars: {e}")
+            return 1
+        conn.close()
+        print(f"Added {added} new calendars")
+        return 0
+
     added = 0
     for url in urls:
         try:
@@ -129,6 +166,7 @@ def main():
     conn.close()
 
     print(f"Added {added} new calendars")
+    return 0
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file